@@ -22,6 +22,8 @@ class Boolean(Value[bool]):
     See Symbol and Value for more information.
     """
 
+    __slots__ = ()
+
     def __and__(self, other: Self) -> Boolean:
         """Implements bitwise and using the & operator."""
         return and_(self, other)
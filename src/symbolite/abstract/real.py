@@ -14,12 +14,15 @@
 
 from ..core import Value
 from ..core.function import (
+    AssociativeFunction,
     BinaryFunction,
     BinaryOperator,
     Function3,
     UnaryFunction,
     UnaryOperator,
 )
+from ..core.function import balanced_product as balanced_product
+from ..core.function import balanced_sum as balanced_sum
 from .boolean import Boolean
 
 NumberT = int | float
@@ -31,6 +34,8 @@ class Real(Value[NumberT]):
     See Symbol and Value for more information.
     """
 
+    __slots__ = ()
+
     def eq(self, other: Any) -> Boolean:
         return eq(self, other)
 
@@ -200,6 +205,13 @@ def __invert__(self) -> Real:
 pos = UnOp("pos", "real", precedence=2, fmt="+{}", output_type=Real)
 invert = UnOp("invert", "real", precedence=2, fmt="~{}", output_type=Real)
 
+# N-ary associative operations
+# (e.g. sum_of(*terms) instead of a chain of additions)
+sum_of = AssociativeFunction[Real | NumberT, Real]("sum_of", "real", output_type=Real)
+product_of = AssociativeFunction[Real | NumberT, Real](
+    "product_of", "real", output_type=Real
+)
+
 UnFun = UnaryFunction[Real | NumberT, Real]
 BinFun = BinaryFunction[Real | NumberT, Real]
 
@@ -265,7 +277,9 @@ def __invert__(self) -> Real:
 nan = Real("real.nan")
 tau = Real("rea.tau")
 
+
 del (
+    AssociativeFunction,
     BinaryFunction,
     BinaryOperator,
     UnaryFunction,
@@ -14,10 +14,13 @@
 
 from ..core import Value
 from ..core.function import (
+    AssociativeFunction,
     BinaryOperator,
     Function3,
     UnaryOperator,
 )
+from ..core.function import balanced_product as balanced_product
+from ..core.function import balanced_sum as balanced_sum
 from .boolean import Boolean
 
 
@@ -48,6 +51,8 @@ class Symbol(Value[Any]):
     See Value for more information.
     """
 
+    __slots__ = ()
+
     # Comparison methods (not operator)
     def eq(self, other: Any) -> Boolean:
         return eq(self, other)
@@ -248,6 +253,13 @@ def __invert__(self) -> Symbol:
 xor = BinOp("xor", "symbol", precedence=-3, fmt="{} ^ {}", output_type=Symbol)
 or_ = BinOp("or_", "symbol", precedence=-4, fmt="{} | {}", output_type=Symbol)
 
+# N-ary associative operations
+# (e.g. sum_of(*terms) instead of a chain of additions)
+sum_of = AssociativeFunction[Any, Symbol]("sum_of", "symbol", output_type=Symbol)
+product_of = AssociativeFunction[Any, Symbol](
+    "product_of", "symbol", output_type=Symbol
+)
+
 # Unary operators
 neg = UnOp("neg", "symbol", precedence=2, fmt="-{}", output_type=Symbol)
 pos = UnOp("pos", "symbol", precedence=2, fmt="+{}", output_type=Symbol)
@@ -19,6 +19,8 @@
     UnaryFunction,
     UnaryOperator,
 )
+from ..core.function import balanced_product as balanced_product
+from ..core.function import balanced_sum as balanced_sum
 from .boolean import Boolean
 from .real import NumberT, Real
 from .symbol import Symbol
@@ -32,6 +34,8 @@ class Vector(Value[VectorT]):
     See Symbol and Value for information
     """
 
+    __slots__ = ()
+
     def eq(self, other: Any) -> Boolean:
         return eq(self, other)
 
@@ -11,7 +11,9 @@
 """
 
 from .call import Call
+from .dag import ExpressionDAG
 from .function import Function, Operator
+from .interning import interning, set_interning
 from .value import Value
 
 
@@ -21,8 +23,11 @@ class Unsupported(ValueError):
 
 __all__ = [
     "Call",
+    "ExpressionDAG",
     "Value",
     "Function",
     "Operator",
     "Unsupported",
+    "interning",
+    "set_interning",
 ]
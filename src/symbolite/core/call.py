@@ -11,9 +11,10 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, NamedTuple
+from typing import TYPE_CHECKING, Any, NamedTuple, Self
 
-from .symbolite_object import SymboliteObject, set_symbolite_info
+from .interning import canonical
+from .symbolite_object import SymboliteObject, get_symbolite_info, set_symbolite_info
 
 if TYPE_CHECKING:
     from .function import SymbolicCallable
@@ -26,7 +27,32 @@ class CallInfo(NamedTuple):
 
 
 class Call(SymboliteObject[CallInfo]):
-    """A Function that has been called with certain arguments."""
+    """A Function that has been called with certain arguments.
+
+    The object is built in __new__ so that, if interning is enabled,
+    an existing equal instance can be returned. Subclasses defining
+    their own __init__ (e.g. taking additional arguments) are built
+    when it calls Call.__init__, and are not interned.
+    """
+
+    __slots__ = ()
+
+    def __new__(
+        cls,
+        func: SymbolicCallable[Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any] | tuple[tuple[str, Any], ...],
+        *extra_args: Any,
+        **extra_kwargs: Any,
+    ) -> Self:
+        obj = object.__new__(cls)
+        if cls.__init__ is not Call.__init__:
+            return obj
+
+        if isinstance(kwargs, dict):
+            kwargs = tuple(kwargs.items())
+        set_symbolite_info(obj, CallInfo(func, args, kwargs))
+        return canonical(obj, (args, kwargs))
 
     def __init__(
         self,
@@ -34,7 +60,10 @@ def __init__(
         args: tuple[Any, ...],
         kwargs: dict[str, Any] | tuple[tuple[str, Any], ...],
     ) -> None:
-        if isinstance(kwargs, dict):
-            kwargs = tuple(kwargs.items())
+        if self.__class__.__init__ is not Call.__init__:
+            if isinstance(kwargs, dict):
+                kwargs = tuple(kwargs.items())
+            set_symbolite_info(self, CallInfo(func, args, kwargs))
 
-        set_symbolite_info(self, CallInfo(func, args, kwargs))
+    def __getnewargs__(self) -> CallInfo:
+        return get_symbolite_info(self)
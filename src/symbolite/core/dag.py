@@ -0,0 +1,329 @@
+"""
+symbolite.core.dag
+~~~~~~~~~~~~~~~~~~
+
+Flat, array backed representation of symbolic expressions.
+
+An ExpressionDAG stores an expression as a directed acyclic graph
+in which structurally equal subexpressions are stored once. Nodes
+are kept in a struct-of-arrays layout, in topological order
+(children before parents), with the root as the last node:
+
+- opcodes: kind of each node (OP_NAME, OP_CONSTANT, OP_VALUE, OP_CALL).
+- operands: index into the table corresponding to the kind
+  (names, constants, classes, functions).
+- offsets / children: the children of node i are
+  children[offsets[i]:offsets[i + 1]].
+
+Operations (translate, substitute, yield_named) can be applied directly
+to an ExpressionDAG, iterating over the arrays instead of recursing.
+
+:copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Hashable, Iterable, Sequence
+from typing import Any
+
+from .call import Call
+from .interning import type_signature
+from .symbolite_object import get_symbolite_info
+from .value import Name, Value
+
+# A named value (e.g. a user defined or a library value).
+OP_NAME = 0
+# Any python object that is not a Value or a Call (e.g. a number).
+OP_CONSTANT = 1
+# A Value wrapping a Call or a constant (single child).
+OP_VALUE = 2
+# A call of a function or operator (children are args and kwargs values).
+OP_CALL = 3
+
+
+class ExpressionDAG:
+    """Flat directed acyclic graph representation of an expression.
+
+    Use `from_expr` to build it and `to_expr` to convert it back.
+    """
+
+    __slots__ = (
+        "opcodes",
+        "operands",
+        "offsets",
+        "children",
+        "names",
+        "constants",
+        "classes",
+        "functions",
+        "keywords",
+    )
+
+    opcodes: array[int]
+    operands: array[int]
+    offsets: array[int]
+    children: array[int]
+    names: list[Value[Any]]
+    constants: list[Any]
+    classes: list[type[Value[Any]]]
+    functions: list[Any]
+    # Keyword names of the trailing children of call nodes (if any).
+    keywords: dict[int, tuple[str, ...]]
+
+    def __init__(
+        self,
+        opcodes: array[int],
+        operands: array[int],
+        offsets: array[int],
+        children: array[int],
+        names: list[Value[Any]],
+        constants: list[Any],
+        classes: list[type[Value[Any]]],
+        functions: list[Any],
+        keywords: dict[int, tuple[str, ...]],
+    ) -> None:
+        self.opcodes = opcodes
+        self.operands = operands
+        self.offsets = offsets
+        self.children = children
+        self.names = names
+        self.constants = constants
+        self.classes = classes
+        self.functions = functions
+        self.keywords = keywords
+
+    @classmethod
+    def from_expr(cls, expr: Any) -> ExpressionDAG:
+        """Build a DAG from a symbolic expression."""
+        builder = DAGBuilder()
+        return builder.build(builder.add_expr(expr))
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ExpressionDAG):
+            return NotImplemented
+        return all(
+            getattr(self, attr) == getattr(other, attr) for attr in self.__slots__
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"<ExpressionDAG with {len(self)} nodes>"
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, attr) for attr in self.__slots__)
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        for attr, value in zip(self.__slots__, state):
+            setattr(self, attr, value)
+
+    def node_children(self, index: int) -> array[int]:
+        """Indices of the children of a given node."""
+        return self.children[self.offsets[index] : self.offsets[index + 1]]
+
+    def multiplicities(self) -> list[int]:
+        """Number of times each node appears in the expanded expression tree."""
+        counts = [0] * len(self.opcodes)
+        if not counts:
+            return counts
+        counts[-1] = 1
+        offsets, children = self.offsets, self.children
+        for index in range(len(counts) - 1, -1, -1):
+            count = counts[index]
+            if count:
+                for child in children[offsets[index] : offsets[index + 1]]:
+                    counts[child] += count
+        return counts
+
+    def to_expr(self) -> Any:
+        """Convert the DAG back into a symbolic expression."""
+        opcodes, operands = self.opcodes, self.operands
+        offsets, children = self.offsets, self.children
+        names, constants = self.names, self.constants
+        classes, functions = self.classes, self.functions
+        keywords = self.keywords
+
+        out: list[Any] = []
+        for index, opcode in enumerate(opcodes):
+            operand = operands[index]
+            if opcode == OP_CALL:
+                args = [out[c] for c in children[offsets[index] : offsets[index + 1]]]
+                kwnames = keywords.get(index, ())
+                if kwnames:
+                    npos = len(args) - len(kwnames)
+                    kwargs = tuple(zip(kwnames, args[npos:]))
+                    args = args[:npos]
+                else:
+                    kwargs = ()
+                out.append(Call(functions[operand], tuple(args), kwargs))
+            elif opcode == OP_NAME:
+                out.append(names[operand])
+            elif opcode == OP_VALUE:
+                out.append(classes[operand](out[children[offsets[index]]]))
+            else:
+                out.append(constants[operand])
+        return out[-1]
+
+
+class DAGBuilder:
+    """Incrementally build an ExpressionDAG.
+
+    Each add_* method returns the index of the node, reusing
+    an existing node if an equal one was already added.
+    """
+
+    def __init__(self) -> None:
+        self.opcodes = array("b")
+        self.operands = array("q")
+        self.offsets = array("q", [0])
+        self.children = array("q")
+        self.names: list[Value[Any]] = []
+        self.constants: list[Any] = []
+        self.classes: list[type[Value[Any]]] = []
+        self.functions: list[Any] = []
+        self.keywords: dict[int, tuple[str, ...]] = {}
+        self._nodes: dict[Hashable, int] = {}
+        self._functions: dict[Any, int] = {}
+        self._classes: dict[type[Value[Any]], int] = {}
+
+    def _add(
+        self, key: Hashable | None, opcode: int, operand: int, children: Sequence[int]
+    ) -> int:
+        if key is not None:
+            index = self._nodes.get(key)
+            if index is not None:
+                return index
+        index = len(self.opcodes)
+        self.opcodes.append(opcode)
+        self.operands.append(operand)
+        self.children.extend(children)
+        self.offsets.append(len(self.children))
+        if key is not None:
+            self._nodes[key] = index
+        return index
+
+    def add_name(self, value: Value[Any]) -> int:
+        key = (OP_NAME, value)
+        index = self._nodes.get(key)
+        if index is not None:
+            return index
+        self.names.append(value)
+        return self._add(key, OP_NAME, len(self.names) - 1, ())
+
+    def add_constant(self, constant: Any) -> int:
+        try:
+            key: Hashable | None = (OP_CONSTANT, type_signature(constant), constant)
+            index = self._nodes.get(key)
+        except TypeError:
+            key = index = None
+        if index is not None:
+            return index
+        self.constants.append(constant)
+        return self._add(key, OP_CONSTANT, len(self.constants) - 1, ())
+
+    def add_value(self, cls: type[Value[Any]], child: int) -> int:
+        operand = self._classes.get(cls)
+        if operand is None:
+            operand = self._classes[cls] = len(self.classes)
+            self.classes.append(cls)
+        return self._add((OP_VALUE, operand, child), OP_VALUE, operand, (child,))
+
+    def add_call(
+        self, func: Any, children: Iterable[int], kwnames: tuple[str, ...] = ()
+    ) -> int:
+        operand = self._functions.get(func)
+        if operand is None:
+            operand = self._functions[func] = len(self.functions)
+            self.functions.append(func)
+        children = tuple(children)
+        index = self._add(
+            (OP_CALL, operand, children, kwnames), OP_CALL, operand, children
+        )
+        if kwnames:
+            self.keywords[index] = kwnames
+        return index
+
+    def add_expr(self, expr: Any) -> int:
+        """Add a symbolic expression (iteratively) and return the root index."""
+        # Nodes are memoized by identity within this call, expr keeps them alive.
+        memo: dict[int, int] = {}
+        stack: list[tuple[Any, bool]] = [(expr, False)]
+        while stack:
+            obj, expanded = stack.pop()
+            if not expanded and id(obj) in memo:
+                continue
+            if isinstance(obj, Value):
+                value = get_symbolite_info(obj).value
+                if isinstance(value, Name):
+                    memo[id(obj)] = self.add_name(obj)
+                elif expanded:
+                    memo[id(obj)] = self.add_value(obj.__class__, memo[id(value)])
+                else:
+                    stack.append((obj, True))
+                    stack.append((value, False))
+            elif isinstance(obj, Call):
+                info = get_symbolite_info(obj)
+                if expanded:
+                    memo[id(obj)] = self.add_call(
+                        info.func,
+                        [memo[id(arg)] for arg in info.args]
+                        + [memo[id(arg)] for _, arg in info.kwargs_items],
+                        tuple(k for k, _ in info.kwargs_items),
+                    )
+                else:
+                    stack.append((obj, True))
+                    stack.extend((v, False) for _, v in reversed(info.kwargs_items))
+                    stack.extend((arg, False) for arg in reversed(info.args))
+            else:
+                memo[id(obj)] = self.add_constant(obj)
+        return memo[id(expr)]
+
+    def build(self, root: int) -> ExpressionDAG:
+        """Build a DAG with the nodes reachable from root (which will be the last one)."""
+        offsets, children = self.offsets, self.children
+
+        # As children are always added before their parents,
+        # all reachable nodes have an index smaller than root.
+        reachable = bytearray(root + 1)
+        reachable[root] = 1
+        for index in range(root, -1, -1):
+            if reachable[index]:
+                for child in children[offsets[index] : offsets[index + 1]]:
+                    reachable[child] = 1
+
+        dag = ExpressionDAG(
+            array("b"), array("q"), array("q", [0]), array("q"), [], [], [], [], {}
+        )
+        tables = {
+            OP_NAME: (self.names, dag.names),
+            OP_CONSTANT: (self.constants, dag.constants),
+            OP_VALUE: (self.classes, dag.classes),
+            OP_CALL: (self.functions, dag.functions),
+        }
+        remap_operand: dict[tuple[int, int], int] = {}
+        remap = array("q", bytes(8 * (root + 1)))
+        for index in range(root + 1):
+            if not reachable[index]:
+                continue
+            opcode, operand = self.opcodes[index], self.operands[index]
+            new_operand = remap_operand.get((opcode, operand))
+            if new_operand is None:
+                source, target = tables[opcode]
+                new_operand = remap_operand[(opcode, operand)] = len(target)
+                target.append(source[operand])
+            new_index = remap[index] = len(dag.opcodes)
+            dag.opcodes.append(opcode)
+            dag.operands.append(new_operand)
+            dag.children.extend(
+                remap[child] for child in children[offsets[index] : offsets[index + 1]]
+            )
+            dag.offsets.append(len(dag.children))
+            kwnames = self.keywords.get(index)
+            if kwnames:
+                dag.keywords[new_index] = kwnames
+        return dag
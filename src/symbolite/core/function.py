@@ -10,8 +10,9 @@
 
 from __future__ import annotations
 
+import operator
 import types
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from typing import Any, Literal, NamedTuple, Protocol, Self, cast
 
 from .call import Call
@@ -37,6 +38,8 @@ class FunctionInfo[O: Value[Any]](NamedTuple):
 class Function[O: Value[Any]](SymboliteObject[FunctionInfo[O]]):
     """A callable primitive that will return a Value with a Call as value."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
@@ -60,12 +63,14 @@ def __call__(self, *args: Any, **kwds: Any) -> O:
                 f"Invalid number of arguments ({len(args)}), expected {info.arity}."
             )
 
-        expr = Call(self, args, tuple())
+        expr = Call(self, args, ())
 
         return info.output_type(expr)
 
 
 class UnaryFunction[I, O: Value[Any]](Function[O]):
+    __slots__ = ()
+
     def __init__(self, name: str, namespace: str = "", *, output_type: type[O]) -> None:
         set_symbolite_info(self, FunctionInfo(name, namespace, 1, output_type))
 
@@ -74,6 +79,8 @@ def __call__(self, arg1: I) -> O:
 
 
 class BinaryFunction[I, O: Value[Any]](Function[O]):
+    __slots__ = ()
+
     def __init__(self, name: str, namespace: str = "", *, output_type: type[O]) -> None:
         set_symbolite_info(self, FunctionInfo(name, namespace, 2, output_type))
 
@@ -82,6 +89,8 @@ def __call__(self, arg1: I, arg2: I) -> O:
 
 
 class Function3[I, O: Value[Any]](Function[O]):
+    __slots__ = ()
+
     def __init__(self, name: str, namespace: str = "", *, output_type: type[O]) -> None:
         set_symbolite_info(self, FunctionInfo(name, namespace, 3, output_type))
 
@@ -89,6 +98,91 @@ def __call__(self, arg1: I, arg2: I, arg3: I) -> O:
         return super().__call__(arg1, arg2, arg3)
 
 
+class AssociativeFunction[I, O: Value[Any]](Function[O]):
+    """A function of any number of arguments implementing an associative operation.
+
+    Arguments that are themselves calls to the same function are flattened,
+    so that f(f(a, b), c) is stored as f(a, b, c). Reductions over many
+    operands can then be expressed with depth 1 instead of a chain of
+    binary operations as deep as the number of operands.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, name: str, namespace: str = "", *, output_type: type[O]) -> None:
+        set_symbolite_info(self, FunctionInfo(name, namespace, None, output_type))
+
+    def __call__(self, *args: I) -> O:
+        flat: list[Any] = []
+        for arg in args:
+            if isinstance(arg, Value):
+                value = get_symbolite_info(arg).value
+                if isinstance(value, Call):
+                    call_info = get_symbolite_info(value)
+                    if call_info.func is self:
+                        flat.extend(call_info.args)
+                        continue
+            flat.append(arg)
+
+        info = get_symbolite_info(self)
+        return info.output_type(Call(self, tuple(flat), ()))
+
+
+_NOT_SET: Any = object()
+
+
+def balanced_reduce[T](
+    func: Callable[[T, T], T], operands: Iterable[T], initial: T = _NOT_SET
+) -> T:
+    """Reduce operands with a binary function building a balanced tree.
+
+    Operands are combined pairwise, level by level, preserving their order:
+    ((a, b), (c, d)), e instead of (((a, b), c), d), e. The result is built
+    with N - 1 calls and has a depth of ceil(log2(N)) instead of N - 1.
+
+    Parameters
+    ----------
+    func
+        binary function (e.g. an operator) assumed to be associative.
+    operands
+        values to reduce.
+    initial
+        value returned if there are no operands.
+    """
+    items = list(operands)
+    if not items:
+        if initial is _NOT_SET:
+            raise TypeError("balanced_reduce() of empty iterable with no initial value")
+        return initial
+
+    while len(items) > 1:
+        paired = [func(a, b) for a, b in zip(items[::2], items[1::2])]
+        if len(items) % 2:
+            paired.append(items[-1])
+        items = paired
+    return items[0]
+
+
+def balanced_sum[T](operands: Iterable[T]) -> T | int:
+    """Add operands building a balanced tree of additions.
+
+    The depth of the result grows as log2 of the number of operands
+    instead of linearly as with the builtin sum. Returns 0 if empty.
+    """
+    items: Iterable[T | int] = operands
+    return balanced_reduce(operator.add, items, 0)
+
+
+def balanced_product[T](operands: Iterable[T]) -> T | int:
+    """Multiply operands building a balanced tree of multiplications.
+
+    The depth of the result grows as log2 of the number of operands
+    instead of linearly as with math.prod. Returns 1 if empty.
+    """
+    items: Iterable[T | int] = operands
+    return balanced_reduce(operator.mul, items, 1)
+
+
 class OperatorInfo[O: Value[Any]](NamedTuple):
     name: str
     namespace: str
@@ -105,6 +199,8 @@ class Operator[O: Value[Any]](SymboliteObject[OperatorInfo[O]]):
     as string in algebraic manner.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
@@ -127,12 +223,14 @@ def __call__(self, *args: Any, **kwds: Any) -> O:
                 f"Invalid number of arguments ({len(args)}), expected {info.arity}."
             )
 
-        expr = Call(self, args, tuple())
+        expr = Call(self, args, ())
 
         return info.output_type(expr)
 
 
 class UnaryOperator[I, O: Value[Any]](Operator[O]):
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
@@ -152,10 +250,15 @@ def __init__(
         )
 
     def __call__(self, arg1: I) -> O:
-        return super().__call__(arg1)
+        # The arity is known, so the Call is built directly
+        # as this is the hot path of operator overloading.
+        info = get_symbolite_info(self)
+        return info.output_type(Call(self, (arg1,), ()))
 
 
 class BinaryOperator[I1, I2, O: Value[Any]](Operator[O]):
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
@@ -175,7 +278,10 @@ def __init__(
         )
 
     def __call__(self, arg1: I1, arg2: I2) -> O:
-        return super().__call__(arg1, arg2)
+        # The arity is known, so the Call is built directly
+        # as this is the hot path of operator overloading.
+        info = get_symbolite_info(self)
+        return info.output_type(Call(self, (arg1, arg2), ()))
 
 
 class UserFunctionInfo[P, T, O: Value[Any]](NamedTuple):
@@ -188,7 +294,19 @@ class UserFunctionInfo[P, T, O: Value[Any]](NamedTuple):
     impls: tuple[tuple[types.ModuleType | Literal["default"], Callable[[P], T]], ...]
 
 
+def _set_user_function_info(
+    obj: UserFunction[Any, Any, Any], info: UserFunctionInfo[Any, Any, Any]
+) -> None:
+    # Implementations are not part of the hash, so that it does not change
+    # when they are registered after the function has been used
+    # (e.g. in calls that are dictionary keys or interned).
+    set_symbolite_info(obj, info)
+    object.__setattr__(obj, "__symbolite_hash__", hash(info._replace(impls=())))
+
+
 class UserFunction[P, T, O: Value[Any]](SymboliteObject[UserFunctionInfo[P, T, O]]):
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
@@ -197,7 +315,7 @@ def __init__(
         arity: int | None = None,
         output_type: type[O],
     ) -> None:
-        set_symbolite_info(
+        _set_user_function_info(
             self, UserFunctionInfo(name, namespace, arity, output_type, ())
         )
 
@@ -216,7 +334,11 @@ def register_impl(
     ) -> None:
         info = get_symbolite_info(self)
         info = info._replace(impls=info.impls + ((libsl, func),))
-        set_symbolite_info(self, info)
+        _set_user_function_info(self, info)
+
+    def __setstate__(self, state: Any) -> None:
+        super().__setstate__(state)
+        _set_user_function_info(self, get_symbolite_info(self))
 
     def __call__(self, *args: Any, **kwds: Any) -> O:
         info = get_symbolite_info(self)
@@ -231,6 +353,6 @@ def __call__(self, *args: Any, **kwds: Any) -> O:
                 f"Invalid number of arguments ({len(args)}), expected {info.arity}."
             )
 
-        expr = Call(self, args, tuple())
+        expr = Call(self, args, ())
 
         return info.output_type(expr)
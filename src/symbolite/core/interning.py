@@ -0,0 +1,85 @@
+"""
+symbolite.core.interning
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Opt-in hash-consing of symbolic nodes.
+
+When enabled, building a Call or a Value that is structurally
+equal to one that is still alive returns the existing instance.
+Equal subtrees are then the same object, making comparisons
+an identity check and memory proportional to the number of
+unique subexpressions.
+
+Interning is disabled by default, use `interning` or `set_interning`
+to enable it. Interning should be enabled before building the expressions.
+
+:copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import weakref
+from collections.abc import Generator, Hashable
+from contextlib import contextmanager
+from typing import Any
+
+from .symbolite_object import SymboliteObject, get_symbolite_info
+
+_table: weakref.WeakValueDictionary[Hashable, SymboliteObject[Any]] | None = None
+
+
+def is_interning() -> bool:
+    """Return True if interning is enabled."""
+    return _table is not None
+
+
+def set_interning(enabled: bool) -> bool:
+    """Enable or disable interning, returning the previous state.
+
+    Disabling interning drops the table of canonical instances.
+    """
+    global _table
+    previous = _table is not None
+    if not enabled:
+        _table = None
+    elif _table is None:
+        _table = weakref.WeakValueDictionary()
+    return previous
+
+
+@contextmanager
+def interning(enabled: bool = True) -> Generator[None, None, None]:
+    """Context manager to enable (or disable) interning temporarily."""
+    previous = set_interning(enabled)
+    try:
+        yield
+    finally:
+        set_interning(previous)
+
+
+def type_signature(value: Any) -> Hashable | type[Any]:
+    """Types of a literal value, including elements of containers.
+
+    Used to keep apart values that are equal but have a different type
+    (e.g. 1 and 1.0) when interning. Symbolite objects are identified
+    by identity, as equal canonical children are the same object.
+    """
+    if isinstance(value, SymboliteObject):
+        return id(value)
+    if isinstance(value, (tuple, list)):
+        return type(value), tuple(type_signature(el) for el in value)
+    return type(value)
+
+
+def canonical[T: SymboliteObject[Any]](obj: T, content: Any = None) -> T:
+    """Return the canonical instance structurally equal to obj.
+
+    content is the literal part of obj whose type signature must also
+    match. If interning is disabled or obj is not hashable, obj is returned.
+    """
+    table = _table
+    if table is None or obj.__symbolite_hash__ is None:
+        return obj
+    key = (obj.__class__, get_symbolite_info(obj), type_signature(content))
+    return table.setdefault(key, obj)  # type: ignore[return-value]
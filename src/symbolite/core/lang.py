@@ -26,6 +26,8 @@ class AssignInfo(NamedTuple):
 
 
 class Assign(SymboliteObject[AssignInfo]):
+    __slots__ = ()
+
     def __init__(self, lhs: Value[Any], rhs: Any) -> None:
         set_symbolite_info(self, AssignInfo(lhs, rhs))
 
@@ -40,6 +42,8 @@ class BlockInfo(NamedTuple):
 class Block(SymboliteObject[BlockInfo]):
     """A block of code with inputs and outputs."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         inputs: tuple[Value[Any], ...],
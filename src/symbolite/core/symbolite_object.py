@@ -11,7 +11,7 @@
 from __future__ import annotations
 
 from functools import singledispatch
-from typing import Any, NamedTuple, Self, cast
+from typing import Any, NamedTuple
 
 
 class SymboliteObject[R: NamedTuple]:
@@ -20,18 +20,46 @@ class SymboliteObject[R: NamedTuple]:
     Symbolite information is stored in the __symbolite_info__ attributed
     using a NamedTuple specific for each type of symbolic object.
     In this way we make objects opaque
+
+    The hash of the information is computed once, when it is set,
+    and stored in __symbolite_hash__. As children are symbolite objects
+    with their own cached hash, this is proportional to the number of
+    direct children and not to the size of the whole expression.
+    Equality rejects objects with different cached hashes, so the hash
+    must not change during the lifetime of the object.
+
+    Values derived from the information (e.g. the free values of an
+    expression) can be cached in __symbolite_cache__, which is created
+    on first use (see get_symbolite_cache).
+
+    These are stored in slots (subclasses should define empty __slots__)
+    so that nodes do not carry an instance dictionary.
     """
 
+    __slots__ = (
+        "__symbolite_info__",
+        "__symbolite_hash__",
+        "__symbolite_cache__",
+        "__weakref__",
+    )
+
     __symbolite_info__: R
+    __symbolite_hash__: int | None
+    __symbolite_cache__: dict[str, Any] | None
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if self.__class__ is not other.__class__:
             return False
-        other_named = cast(Self, other)
-        return get_symbolite_info(self) == get_symbolite_info(other_named)
+        return structural_eq(self, other)
 
     def __hash__(self) -> int:
-        return hash(get_symbolite_info(self))
+        value = self.__symbolite_hash__
+        if value is None:
+            # Unhashable content, let Python raise the appropriate error.
+            return hash(get_symbolite_info(self))
+        return value
 
     def __str__(self) -> str:
         return self.__class__.__name__ + "#" + str(get_symbolite_info(self))
@@ -39,6 +67,22 @@ def __str__(self) -> str:
     def __repr__(self) -> str:
         return self.__class__.__name__ + "#" + repr(get_symbolite_info(self))
 
+    def __getstate__(self) -> Any:
+        # The cached hash is not pickled as string hashes are salted per process.
+        # Attributes of subclasses with an instance dictionary are kept.
+        info = get_symbolite_info(self)
+        attributes = getattr(self, "__dict__", None)
+        if attributes:
+            return info, attributes
+        return info
+
+    def __setstate__(self, state: Any) -> None:
+        # The information is a NamedTuple, never a plain tuple.
+        if type(state) is tuple:
+            state, attributes = state
+            self.__dict__.update(attributes)
+        set_symbolite_info(self, state)
+
     def __set_name__(self, owner: Any, name: str):
         if name.endswith("__return"):
             return
@@ -51,7 +95,67 @@ def get_symbolite_info[R: NamedTuple](obj: SymboliteObject[R]) -> R:
 
 
 def set_symbolite_info[R: NamedTuple](obj: SymboliteObject[R], info: R):
+    """Set the information of a new symbolite object, caching its hash.
+
+    It should not be used to replace the information of an object that
+    might be in use, as equal objects built before and after would have
+    different hashes.
+    """
+    try:
+        info_hash = hash(info)
+    except TypeError:
+        info_hash = None
     object.__setattr__(obj, "__symbolite_info__", info)
+    object.__setattr__(obj, "__symbolite_hash__", info_hash)
+    object.__setattr__(obj, "__symbolite_cache__", None)
+
+
+def get_symbolite_cache(obj: SymboliteObject[Any]) -> dict[str, Any]:
+    """Cache of values derived from the information of a symbolite object.
+
+    As the information is not modified after creation, derived values
+    can be stored here to be reused.
+    """
+    cache = obj.__symbolite_cache__
+    if cache is None:
+        cache = {}
+        object.__setattr__(obj, "__symbolite_cache__", cache)
+    return cache
+
+
+def structural_eq(left: Any, right: Any) -> bool:
+    """Compare two (possibly nested) symbolite structures.
+
+    Identical objects are accepted and objects with different cached
+    hashes are rejected without looking into their content. Otherwise,
+    the information is compared iteratively, so the comparison of
+    deep expressions does not reach the recursion limit.
+    """
+    stack = [(left, right)]
+    while stack:
+        left, right = stack.pop()
+        if left is right:
+            continue
+        if isinstance(left, SymboliteObject):
+            if left.__class__ is not right.__class__:
+                return False
+            left_hash = left.__symbolite_hash__
+            right_hash = right.__symbolite_hash__
+            if (
+                left_hash is not None
+                and right_hash is not None
+                and left_hash != right_hash
+            ):
+                return False
+            left = get_symbolite_info(left)
+            right = get_symbolite_info(right)
+        if isinstance(left, tuple) and type(left) is type(right):
+            if len(left) != len(right):
+                return False
+            stack.extend(zip(reversed(left), reversed(right)))
+        elif not left == right:
+            return False
+    return True
 
 
 @singledispatch
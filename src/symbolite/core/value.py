@@ -8,11 +8,13 @@
 :license: BSD, see LICENSE for more details.
 """
 
-import random
-import string
-from typing import Any, NamedTuple
+import itertools
+import threading
+import weakref
+from typing import Any, NamedTuple, Self
 
 from .call import Call
+from .interning import canonical
 from .symbolite_object import (
     SymboliteObject,
     get_symbolite_info,
@@ -22,9 +24,56 @@
 
 PREFIX = "__symbolite_value_"
 
-
-def id_generator(size: int = 6, chars: str = string.ascii_uppercase + string.digits):
-    return "".join(random.choice(chars) for _ in range(size))
+# Anonymous values are numbered with a process-wide counter
+# (next on itertools.count is atomic) within a namespace.
+_anonymous_counter = itertools.count()
+_anonymous_namespace = ""
+# Next unused number of the namespaces left by reset_anonymous_names.
+_anonymous_next: dict[str, int] = {}
+
+
+def reset_anonymous_names(namespace: str = "", start: int = 0) -> None:
+    """Restart the numbering of anonymous values.
+
+    Names are deterministic: building the same expressions in the same
+    order yields the same names (and therefore the same generated code).
+
+    Parameters
+    ----------
+    namespace
+        included in the generated names, use a different one in each process
+        to avoid collisions when combining expressions built separately.
+    start
+        first number to use. Numbers already used in this process for the
+        namespace cannot be used again, as new values would be equal to
+        existing ones.
+    """
+    global _anonymous_counter, _anonymous_namespace
+
+    if namespace and not namespace.replace("_", "").isalnum():
+        raise ValueError(
+            f"Invalid namespace for anonymous values: {namespace!r}, "
+            "only letters, digits and underscores are allowed."
+        )
+    prefix = namespace + "_" if namespace else ""
+    # Get the next number of the current namespace, without consuming it.
+    used = next(_anonymous_counter)
+    _anonymous_counter = itertools.count(used)
+    _anonymous_next[_anonymous_namespace] = max(
+        used, _anonymous_next.get(_anonymous_namespace, 0)
+    )
+    first_unused = _anonymous_next.get(prefix, 0)
+    if start < first_unused:
+        raise ValueError(
+            f"Anonymous names of namespace {namespace!r} are used up to "
+            f"{first_unused - 1}, start at {first_unused} or later."
+        )
+    _anonymous_namespace = prefix
+    _anonymous_counter = itertools.count(start)
+
+
+def id_generator() -> str:
+    return f"{_anonymous_namespace}{next(_anonymous_counter)}"
 
 
 class Name(NamedTuple):
@@ -40,42 +89,146 @@ class ValueInfo[PT](NamedTuple):
     value: Name | Call | PT
 
 
+def _value_info[PT](name_or_value: Call | Name | PT | str) -> ValueInfo[PT]:
+    if isinstance(name_or_value, str):
+        if not name_or_value:
+            name_or_value = Name(PREFIX + id_generator(), "")
+        else:
+            parts = name_or_value.split(".")
+            if len(parts) == 1:
+                name_or_value = Name(parts[0], "")
+            elif len(parts) == 2:
+                name_or_value = Name(parts[1], parts[0])
+            else:
+                raise ValueError(
+                    f"Invalid value name: expected <name> or <namespace>.<name>, got {name_or_value!r}"
+                )
+    return ValueInfo(name_or_value)
+
+
 class Value[PT](SymboliteObject[ValueInfo[PT]]):
-    """A symbolic value."""
+    """A symbolic value.
+
+    The object is built in __new__ so that, if interning is enabled,
+    an existing equal instance can be returned. Subclasses defining
+    their own __init__ (e.g. taking additional arguments) are built
+    when it calls Value.__init__, and are not interned.
+    """
+
+    __slots__ = ()
+
+    def __new__(
+        cls, name_or_value: Call | Name | PT | str = "", *args: Any, **kwargs: Any
+    ) -> Self:
+        obj = object.__new__(cls)
+        if cls.__init__ is not Value.__init__:
+            return obj
+        info = _value_info(name_or_value)
+        set_symbolite_info(obj, info)
+        return canonical(obj, info.value)
 
     def __init__(self, name_or_value: Call | Name | PT | str = "") -> None:
-        if isinstance(name_or_value, str):
-            if not name_or_value:
-                name_or_value = Name(PREFIX + id_generator(), "")
-            else:
-                parts = name_or_value.split(".")
-                if len(parts) == 1:
-                    name_or_value = Name(parts[0], "")
-                elif len(parts) == 2:
-                    name_or_value = Name(parts[1], parts[0])
-                else:
-                    raise ValueError(
-                        f"Invalid value name: expected <name> or <namespace>.<name>, got {name_or_value!r}"
-                    )
-        set_symbolite_info(self, ValueInfo(name_or_value))
+        if self.__class__.__init__ is not Value.__init__:
+            set_symbolite_info(self, _value_info(name_or_value))
+
+    def __getnewargs__(self) -> ValueInfo[PT]:
+        return get_symbolite_info(self)
+
+
+def _with_name[V: Value[Any]](obj: V, name: Name) -> V:
+    """A copy of obj with another name."""
+    cls = obj.__class__
+    if cls.__init__ is Value.__init__:
+        return cls(name)
+    # Subclasses with their own __init__ might require other arguments,
+    # the copy is built as Value.__init__ would do and keeps the attributes.
+    new = object.__new__(cls)
+    set_symbolite_info(new, ValueInfo(name))
+    attributes = getattr(obj, "__dict__", None)
+    if attributes:
+        new.__dict__.update(attributes)
+    return new
+
+
+# Values renamed in each owner (old -> new), so that expressions defined
+# afterwards in the same class body can be rewritten with the named values.
+_renamed: weakref.WeakKeyDictionary[Any, dict[Any, Any]] = weakref.WeakKeyDictionary()
+_renamed_lock = threading.Lock()
+
+# Attribute types whose content is rewritten with renamed values
+# (besides symbolite objects other than values, e.g. blocks).
+_CONTAINERS = (tuple, list, dict)
+
+
+def _rename_content(content: Any, renamed: dict[Any, Any]) -> Any:
+    """Substitute renamed values in expressions inside (nested) tuples,
+    lists and dicts, returning content itself if nothing changes."""
+    if isinstance(content, SymboliteObject):
+        from ..ops import substitute
+
+        return substitute(content, renamed)
+
+    cls = type(content)
+    if cls is dict:
+        items = {key: _rename_content(item, renamed) for key, item in content.items()}
+        if any(items[key] is not item for key, item in content.items()):
+            return items
+    elif cls is tuple or cls is list:
+        elements = [_rename_content(item, renamed) for item in content]
+        if any(new is not old for new, old in zip(elements, content)):
+            return cls(elements)
+    return content
 
 
 @set_name.register(Value)
 def set_name_value(obj: Value[Any], owner: Any, name: str):
+    """Name a value assigned as a class attribute.
+
+    Values are immutable: instead of modifying obj, a new value with the
+    attribute name replaces it in the owner, and expressions in other
+    attributes (also inside tuples, lists, dicts, blocks and assignments)
+    are rewritten if they refer to values renamed in the same owner.
+    """
     info = get_symbolite_info(obj)
 
     value = info.value
-    if isinstance(value, Name):
-        current_name = value.name
-
-        if value.namespace != "":
-            return
-
-        if not current_name.startswith(PREFIX) and current_name != name:
-            import warnings
-
-            warnings.warn(
-                f"Mismatched names in attribute {name}: {type(obj)} is named {current_name}"
-            )
-
-        set_symbolite_info(obj, ValueInfo(Name(name, "")))
+    if not isinstance(value, Name):
+        with _renamed_lock:
+            renamed = dict(_renamed.get(owner, {}))
+        if renamed and isinstance(value, Call):
+            from ..ops import substitute
+
+            new = substitute(obj, renamed)
+            if new != obj:
+                setattr(owner, name, new)
+        return
+
+    current_name = value.name
+
+    if value.namespace != "" or current_name == name:
+        return
+
+    if not current_name.startswith(PREFIX):
+        import warnings
+
+        warnings.warn(
+            f"Mismatched names in attribute {name}: {type(obj)} is named {current_name}"
+        )
+
+    new = _with_name(obj, Name(name, ""))
+    with _renamed_lock:
+        renamed = _renamed.setdefault(owner, {})
+        renamed[obj] = new
+        renamed = dict(renamed)
+    setattr(owner, name, new)
+
+    # Containers (e.g. tuples of expressions) do not get a set_name call,
+    # and other symbolite objects (e.g. blocks) do not rename values,
+    # so those already in the owner are rewritten with each renamed value.
+    for attr, content in list(vars(owner).items()):
+        if type(content) in _CONTAINERS or (
+            isinstance(content, SymboliteObject) and not isinstance(content, Value)
+        ):
+            rewritten = _rename_content(content, renamed)
+            if rewritten is not content:
+                setattr(owner, attr, rewritten)
@@ -0,0 +1,26 @@
+"""
+symbolite.impl._utils
+~~~~~~~~~~~~~~~~~~~~~
+
+Helpers shared by implementation modules.
+
+:copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable
+from typing import Any
+
+
+def nary(func: Callable[[Any, Any], Any], start: Any) -> Callable[..., Any]:
+    """Variadic version of an associative binary function,
+    reducing its arguments from start (the identity of func).
+    """
+
+    def _internal(*args: Any) -> Any:
+        return functools.reduce(func, args, start)
+
+    return _internal
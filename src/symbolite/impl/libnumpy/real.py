@@ -17,6 +17,7 @@
 import numpy as np
 
 from ...core import Unsupported
+from .._utils import nary
 
 # Comparison methods (not operator)
 eq = op.eq
@@ -66,6 +67,11 @@ def _internal(a: Any, b: Any) -> Any:
 rxor = _rev(op.xor)
 ror = _rev(op.or_)
 
+
+# N-ary associative operators
+sum_of = nary(np.add, 0)
+product_of = nary(np.multiply, 1)
+
 # Unary operators
 neg = op.neg
 pos = op.pos
@@ -127,4 +133,4 @@ def _internal(a: Any, b: Any) -> Any:
 
 Real = Unsupported
 
-del np, Unsupported
+del np, Unsupported, nary
@@ -43,6 +43,9 @@ def Real(name: str) -> CodeExpr:
 xor = as_operator(abstract_real.xor)
 or_ = as_operator(abstract_real.or_)
 
+sum_of = as_function(abstract_real.sum_of)
+product_of = as_function(abstract_real.product_of)
+
 neg = as_operator(abstract_real.neg)
 pos = as_operator(abstract_real.pos)
 invert = as_operator(abstract_real.invert)
@@ -131,6 +134,8 @@ def pow(*args: object, **kwargs: object):
     "and_",
     "xor",
     "or_",
+    "sum_of",
+    "product_of",
     "neg",
     "pos",
     "invert",
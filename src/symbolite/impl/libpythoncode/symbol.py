@@ -38,6 +38,9 @@
 xor = as_operator(abstract_symbol.xor)
 or_ = as_operator(abstract_symbol.or_)
 
+sum_of = as_function(abstract_symbol.sum_of)
+product_of = as_function(abstract_symbol.product_of)
+
 neg = as_operator(abstract_symbol.neg)
 pos = as_operator(abstract_symbol.pos)
 invert = as_operator(abstract_symbol.invert)
@@ -71,6 +74,8 @@ def Symbol(name: str) -> CodeExpr:
     "and_",
     "xor",
     "or_",
+    "sum_of",
+    "product_of",
     "neg",
     "pos",
     "invert",
@@ -16,6 +16,7 @@
 from typing import Any
 
 from ...core import Unsupported
+from .._utils import nary
 
 _pow = pow
 
@@ -73,6 +74,11 @@ def _internal(a: Any, b: Any) -> Any:
 rxor = _rev(op.xor)
 ror = _rev(op.or_)
 
+
+# N-ary associative operators
+sum_of = nary(op.add, 0)
+product_of = nary(op.mul, 1)
+
 # Unary operators
 neg = op.neg
 pos = op.pos
@@ -144,4 +150,4 @@ def _internal(a: Any, b: Any) -> Any:
 
 Real = Unsupported
 
-del math, Unsupported, _rev, op, _pow
+del math, Unsupported, _rev, op, _pow, nary
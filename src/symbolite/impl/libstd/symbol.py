@@ -14,6 +14,8 @@
 import operator as op
 import typing as ty
 
+from .._utils import nary
+
 _pow = pow
 
 
@@ -70,10 +72,15 @@ def _internal(a: ty.Any, b: ty.Any) -> ty.Any:
 rxor = _rev(op.xor)
 ror = _rev(op.or_)
 
+
+# N-ary associative operators
+sum_of = nary(op.add, 0)
+product_of = nary(op.mul, 1)
+
 # Unary operators
 neg = op.neg
 pos = op.pos
 invert = op.inv
 
 
-del _rev, op, _pow
+del _rev, op, _pow, nary
@@ -68,6 +68,10 @@ def _internal(a: Any, b: Any) -> Any:
 rxor = _rev(op.xor)
 ror = _rev(op.or_)
 
+# N-ary associative operators
+sum_of = sy.Add
+product_of = sy.Mul
+
 # Unary operators
 neg = op.neg
 pos = op.pos
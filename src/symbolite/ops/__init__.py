@@ -4,29 +4,54 @@
 
 Operations to inspect and manipulate symbolic structures:
 
+- analyze: Summarize a symbolite object in a single walk.
 - as_code: Convert a symbolite object to python code.
+- compile_expr: Compile a symbolite expression into a Python function.
+- cse: Bind repeated subexpressions to temporary values in a Block.
 - translate: Translate a symbolite object using a backend module.
+- fingerprint: Stable digest of a symbolite object, usable as cache key.
+- Visitor, Rewriter: base classes to write custom passes.
+- RewriteRule, RuleSet: rewrite expressions with pattern based rules.
 - substitue: replac
 
 :copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
 :license: BSD, see LICENSE for more details.
 """
 
+from ._analyze import ExpressionSummary, analyze, find_unsupported
 from ._as_code import as_code
+from ._compile import compile_expr
+from ._cse import cse
+from ._fingerprint import fingerprint
 from ._get_name import get_name, get_namespace
-from ._substitute import substitute
-from ._translate import translate
-from ._tree_view import tree_view
+from ._rules import RewriteRule, RuleSet
+from ._substitute import substitute, substitute_many
+from ._translate import Translator, translate
+from ._tree_view import Printer, tree_view
+from ._visitor import Rewriter, Visitor
 from ._yield_named import yield_named
 from .base import count_named
 
 __all__ = [
+    "analyze",
     "count_named",
+    "ExpressionSummary",
+    "find_unsupported",
     "as_code",
+    "compile_expr",
+    "cse",
+    "fingerprint",
     "get_name",
     "get_namespace",
     "substitute",
+    "substitute_many",
     "translate",
+    "Translator",
     "tree_view",
+    "Printer",
     "yield_named",
+    "Visitor",
+    "Rewriter",
+    "RewriteRule",
+    "RuleSet",
 ]
@@ -0,0 +1,201 @@
+"""
+symbolite.ops._analyze
+~~~~~~~~~~~~~~~~~~~~~~
+
+Summarize symbolic structures in a single pass.
+
+Inspecting an expression (named structures, free values, namespaces,
+size) used to require one walk per question. `analyze` walks the
+expression once and collects all of them in an ExpressionSummary,
+which is cached in the expression.
+
+:copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import types
+from collections.abc import Callable, Mapping
+from typing import Any, NamedTuple
+
+from ..core import Unsupported
+from ..core.call import Call
+from ..core.function import Function, Operator, UserFunction
+from ..core.symbolite_object import (
+    SymboliteObject,
+    get_symbolite_cache,
+    get_symbolite_info,
+)
+from ..core.value import Value
+from ._get_name import get_namespace
+from ._translate import resolve
+from ._traversal import Handler
+from ._yield_named import _handlers
+from .base import is_free_value
+
+# Kinds of nodes
+_STRUCTURE = 0
+_CALL = 1
+_FUNCTION = 2
+_LEAF = 3
+
+
+class ExpressionSummary(NamedTuple):
+    """Summary of a symbolic expression.
+
+    Counts refer to the expanded expression tree, i.e. subexpressions
+    shared in the expression are counted as many times as they appear.
+    """
+
+    #: number of occurrences of each named structure,
+    #: in order of first appearance.
+    counts: Mapping[Any, int]
+    #: named structures in order of first appearance.
+    named: tuple[Any, ...]
+    #: user defined values in order of first appearance.
+    free_values: tuple[Value[Any], ...]
+    #: namespaces of the named structures.
+    namespaces: frozenset[str]
+    #: functions and operators used, by namespace.
+    functions: Mapping[str, tuple[Any, ...]]
+    #: number of calls and leaves (values and literals).
+    node_count: int
+    #: maximum number of nested calls.
+    depth: int
+
+
+def _summarize(obj: Any) -> ExpressionSummary:
+    # Unique nodes are visited once, in pre-order (to keep the order of first
+    # appearance), and listed in post-order (children before parents) to
+    # compute the multiplicities and depths without walking shared subtrees again.
+    lookup: dict[type, tuple[Callable[..., Any], Handler | None]] = {}
+    # id -> (node, named items, children ids, kind)
+    nodes: dict[int, tuple[Any, tuple[Any, ...], tuple[int, ...], int]] = {}
+    named: dict[Any, None] = {}
+    post: list[int] = []
+    stack: list[tuple[Any, bool]] = [(obj, False)]
+    items: tuple[Any, ...]
+    children: tuple[Any, ...]
+    while stack:
+        node, done = stack.pop()
+        if done:
+            post.append(id(node))
+            continue
+        if id(node) in nodes:
+            continue
+        cls = node.__class__
+        impl, handler = lookup.get(cls) or lookup.setdefault(cls, _handlers.get(cls))
+        if handler is None:
+            items, children = tuple(impl(node)), ()
+        else:
+            found, children = handler(node)
+            items = tuple(found)
+        if isinstance(node, Call):
+            kind = _CALL
+        elif isinstance(node, Function | Operator | UserFunction):
+            kind = _FUNCTION
+        elif children:
+            kind = _STRUCTURE
+        else:
+            kind = _LEAF
+        nodes[id(node)] = (node, items, tuple(map(id, children)), kind)
+        named.update(dict.fromkeys(items))
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(children))
+
+    multiplicity = dict.fromkeys(post, 0)
+    multiplicity[id(obj)] = 1
+    counts = dict.fromkeys(named, 0)
+    node_count = 0
+    for key in reversed(post):
+        _, items, child_ids, kind = nodes[key]
+        count = multiplicity[key]
+        for child_id in child_ids:
+            multiplicity[child_id] += count
+        for item in items:
+            counts[item] += count
+        if kind == _CALL or kind == _LEAF:
+            node_count += count
+
+    depths: dict[int, int] = {}
+    for key in post:
+        _, _, child_ids, kind = nodes[key]
+        depth = max(map(depths.__getitem__, child_ids), default=0)
+        depths[key] = depth + 1 if kind == _CALL else depth
+
+    namespaces: set[str] = set()
+    functions: dict[str, list[Any]] = {}
+    for item in named:
+        namespace = get_namespace(item)
+        if namespace is None:
+            continue
+        namespaces.add(namespace)
+        if isinstance(item, Function | Operator | UserFunction):
+            functions.setdefault(namespace, []).append(item)
+
+    named_tuple = tuple(named)
+    return ExpressionSummary(
+        counts=types.MappingProxyType(counts),
+        named=named_tuple,
+        free_values=tuple(filter(is_free_value, named_tuple)),
+        namespaces=frozenset(namespaces),
+        functions=types.MappingProxyType(
+            {namespace: tuple(funcs) for namespace, funcs in functions.items()}
+        ),
+        node_count=node_count,
+        depth=depths[id(obj)],
+    )
+
+
+def analyze(obj: Any) -> ExpressionSummary:
+    """Summarize an expression in a single walk.
+
+    The result is cached in symbolite objects.
+
+    Parameters
+    ----------
+    obj
+        symbolic expression.
+    """
+    if not isinstance(obj, SymboliteObject):
+        return _summarize(obj)
+
+    cache = get_symbolite_cache(obj)
+    summary = cache.get("analysis")
+    if summary is None:
+        summary = cache["analysis"] = _summarize(obj)
+    return summary
+
+
+def find_unsupported(obj: Any, libsl: types.ModuleType) -> tuple[Any, ...]:
+    """Library structures (functions, operators, constants) and user
+    functions inside an expression that are not supported by an
+    implementation module, in order of first appearance.
+
+    Parameters
+    ----------
+    obj
+        symbolic expression.
+    libsl
+        implementation module.
+    """
+    unsupported: list[Any] = []
+    for item in analyze(obj).named:
+        if isinstance(item, UserFunction):
+            impls = get_symbolite_info(item).impls
+            if not any(k is libsl or k == "default" for k, _ in impls):
+                unsupported.append(item)
+            continue
+        namespace = get_namespace(item)
+        if not namespace:
+            continue
+        info = get_symbolite_info(item)
+        name = info.value.name if isinstance(item, Value) else info.name
+        try:
+            value = resolve(libsl, item, namespace, name)
+        except AttributeError:
+            value = Unsupported
+        if value is Unsupported:
+            unsupported.append(item)
+    return tuple(unsupported)
@@ -0,0 +1,147 @@
+"""
+symbolite.ops._compile
+~~~~~~~~~~~~~~~~~~~~~~
+
+Compile symbolic expressions into Python functions.
+
+The expression is translated to Python code (using libpythoncode),
+wrapped in a function taking the inputs as positional arguments and
+compiled against a value backend. Compiled functions are cached by
+the fingerprint of the expression and the inputs, and the backend;
+expressions with literals that cannot be fingerprinted are not cached.
+
+:copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import keyword
+import threading
+import types
+import warnings
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from ..core.symbolite_object import SymboliteObject, get_symbolite_cache
+from ..core.value import Value
+from ._analyze import analyze
+from ._fingerprint import fingerprint
+from ._get_name import get_name_symbolite_object
+from ._translate import translate
+
+# Names bound to the backend namespaces in the compiled code.
+_RESERVED = frozenset(("real", "symbol", "vector"))
+
+# (expression fingerprint, inputs fingerprints, backend) -> function
+_compiled: dict[tuple[str, tuple[str, ...], types.ModuleType], Callable[..., Any]] = {}
+_compiled_lock = threading.Lock()
+
+
+def _cached_fingerprint(obj: Any) -> str:
+    if not isinstance(obj, SymboliteObject):
+        return fingerprint(obj)
+    cache = get_symbolite_cache(obj)
+    value = cache.get("fingerprint")
+    if value is None:
+        value = cache["fingerprint"] = fingerprint(obj)
+    return value
+
+
+def _source(expr: Any, inputs: Sequence[Value[Any]], name: str) -> str:
+    from ..impl import libpythoncode
+
+    parameters: list[str] = []
+    for value in inputs:
+        parameter = get_name_symbolite_object(value)
+        if (
+            not parameter.isidentifier()
+            or keyword.iskeyword(parameter)
+            or parameter in _RESERVED
+        ):
+            raise ValueError(f"{parameter!r} cannot be used as a parameter name")
+        parameters.append(parameter)
+    if len(set(parameters)) != len(parameters):
+        raise ValueError(f"Repeated parameter names in {parameters}")
+
+    missing = [
+        get_name_symbolite_object(value)
+        for value in analyze(expr).free_values
+        if value not in inputs
+    ]
+    if missing:
+        raise ValueError(f"Values {missing} are not given as inputs")
+
+    body = translate(expr, libpythoncode)
+    return f"def {name}({', '.join(parameters)}):\n    return {body}"
+
+
+def compile_expr(
+    expr: Any,
+    inputs: Sequence[Value[Any]] | None = None,
+    libsl: types.ModuleType | None = None,
+) -> Callable[..., Any]:
+    """Compile an expression (or tuple of expressions) into a Python function.
+
+    The function takes the values of the inputs as positional arguments
+    and evaluates the expression with the given backend. It is cached,
+    so compiling again an equal expression returns the same function
+    (unless the expression contains literals that cannot be fingerprinted).
+
+    Parameters
+    ----------
+    expr
+        symbolic expression.
+    inputs
+        values to use as parameters, in order.
+        Defaults to the free values of the expression in order of appearance.
+    libsl
+        implementation module (of value kind).
+    """
+    from ..impl import Kind, find_module_in_stack
+    from ..impl._lang_value_utils import compile as compile_code
+
+    if libsl is None:
+        libsl = find_module_in_stack()
+    if libsl is None:
+        warnings.warn("No libsl provided, defaulting to Python standard library.")
+        from ..impl import libstd
+
+        libsl = libstd
+    elif libsl.KIND != Kind.VALUE:
+        raise ValueError(
+            f"Implementation module {libsl} of kind {libsl.KIND} cannot be used for compilation."
+        )
+
+    if inputs is None:
+        inputs = analyze(expr).free_values
+    else:
+        inputs = tuple(inputs)
+
+    try:
+        key = (
+            _cached_fingerprint(expr),
+            tuple(map(_cached_fingerprint, inputs)),
+            libsl,
+        )
+    except TypeError:
+        # Literals that cannot be fingerprinted, compiled without caching.
+        key = None
+    if key is not None:
+        function = _compiled.get(key)
+        if function is not None:
+            return function
+
+    source = _source(expr, inputs, "__symbolite_expr")
+    function = compile_code(source, libsl=libsl)["__symbolite_expr"]
+    function.__symbolite_def__ = source
+    if key is None:
+        return function
+    with _compiled_lock:
+        return _compiled.setdefault(key, function)
+
+
+def clear_compiled() -> None:
+    """Clear the cache of compiled functions."""
+    with _compiled_lock:
+        _compiled.clear()
@@ -0,0 +1,190 @@
+"""
+symbolite.ops._cse
+~~~~~~~~~~~~~~~~~~
+
+Common subexpression elimination.
+
+Expressions are added to a DAGBuilder, in which structurally equal
+subexpressions are stored once. Values wrapping calls that are used
+more than once (by different nodes or roots) are bound to temporary
+values by Assign lines of a Block, placed before the first line using
+them, so that every backend translating the Block computes them once.
+
+A Block reassigning a value is split after each reassignment, as
+equal subexpressions before and after it do not compute the same.
+
+:copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from ..abstract.real import Real
+from ..core.call import Call
+from ..core.dag import OP_CALL, OP_NAME, OP_VALUE, DAGBuilder
+from ..core.lang import Assign, Block
+from ..core.symbolite_object import get_symbolite_info
+from ..core.value import Value
+from ._analyze import analyze
+from ._get_name import get_name_symbolite_object
+
+
+def _fresh_names(prefix: str, used: set[str]) -> Iterator[str]:
+    """Yield prefix0, prefix1, ... skipping used names."""
+    number = 0
+    while True:
+        name = f"{prefix}{number}"
+        number += 1
+        if name not in used:
+            yield name
+
+
+def _segments(
+    lines: Sequence[tuple[Value[Any], Any]],
+) -> Iterator[list[tuple[Value[Any], Any]]]:
+    """Split lines after each assignment to a value already assigned
+    or used in the current segment."""
+    segment: list[tuple[Value[Any], Any]] = []
+    seen: set[str] = set()
+    for lhs, rhs in lines:
+        segment.append((lhs, rhs))
+        seen.update(map(get_name_symbolite_object, analyze(rhs).free_values))
+        name = get_name_symbolite_object(lhs)
+        if name in seen:
+            yield segment
+            segment, seen = [], set()
+        else:
+            seen.add(name)
+    if segment:
+        yield segment
+
+
+def _eliminate(
+    lines: Sequence[tuple[Value[Any], Any]], temporaries: Iterator[str]
+) -> list[Assign]:
+    builder = DAGBuilder()
+    roots = [builder.add_expr(rhs) for _, rhs in lines]
+
+    opcodes, operands = builder.opcodes, builder.operands
+    offsets, children = builder.offsets, builder.children
+
+    # Values wrapping a call referenced more than once are repeated.
+    references = [0] * len(opcodes)
+    for root in roots:
+        references[root] += 1
+    for child in children:
+        references[child] += 1
+    repeated = [
+        opcode == OP_VALUE
+        and references[index] > 1
+        and opcodes[children[offsets[index]]] == OP_CALL
+        for index, opcode in enumerate(opcodes)
+    ]
+
+    # Nodes are in topological order (children before parents), so
+    # temporaries are numbered and defined in dependency order.
+    out: list[Any] = []
+    definitions: dict[int, Assign] = {}
+    node: Any
+    for index, opcode in enumerate(opcodes):
+        operand = operands[index]
+        if opcode == OP_CALL:
+            args = [out[c] for c in children[offsets[index] : offsets[index + 1]]]
+            kwnames = builder.keywords.get(index, ())
+            if kwnames:
+                npos = len(args) - len(kwnames)
+                kwargs = tuple(zip(kwnames, args[npos:]))
+                args = args[:npos]
+            else:
+                kwargs = ()
+            node = Call(builder.functions[operand], tuple(args), kwargs)
+        elif opcode == OP_NAME:
+            node = builder.names[operand]
+        elif opcode == OP_VALUE:
+            cls = builder.classes[operand]
+            node = cls(out[children[offsets[index]]])
+            if repeated[index]:
+                temporary = cls(next(temporaries))
+                definitions[index] = Assign(temporary, node)
+                node = temporary
+        else:
+            node = builder.constants[operand]
+        out.append(node)
+
+    # Each temporary is defined before the first line using it,
+    # after the temporaries it depends on.
+    emitted: set[int] = set()
+    result: list[Assign] = []
+    for (lhs, _), root in zip(lines, roots):
+        needed: set[int] = set()
+        stack = [root]
+        while stack:
+            index = stack.pop()
+            if index in needed or index in emitted:
+                continue
+            if repeated[index]:
+                needed.add(index)
+            stack.extend(children[offsets[index] : offsets[index + 1]])
+        for index in sorted(needed):
+            result.append(definitions[index])
+        emitted.update(needed)
+        result.append(Assign(lhs, out[root]))
+    return result
+
+
+def cse(
+    obj: Any,
+    inputs: Sequence[Value[Any]] | None = None,
+    *,
+    name: str = "",
+    prefix: str = "_cse",
+) -> Block:
+    """Eliminate common subexpressions, binding each repeated subexpression
+    once to a temporary value.
+
+    Parameters
+    ----------
+    obj
+        a Block, an expression or a sequence of expressions.
+        Expressions are assigned to outputs named out0, out1, ...
+    inputs
+        inputs of the resulting block (for expressions). Defaults to the free
+        values of the expressions, in order of appearance.
+    name
+        name of the resulting block (for expressions).
+    prefix
+        prefix of the names of the temporary values, numbered from 0 in
+        dependency order. Names already used in the expressions are skipped.
+    """
+    if isinstance(obj, Block):
+        info = get_symbolite_info(obj)
+        lines = [
+            (assign_info.lhs, assign_info.rhs)
+            for assign_info in map(get_symbolite_info, info.lines)
+        ]
+        inputs, outputs, name = info.inputs, info.outputs, info.name
+        used = set(map(get_name_symbolite_object, analyze(obj).free_values))
+    else:
+        exprs = tuple(obj) if isinstance(obj, list | tuple) else (obj,)
+        summary = analyze(exprs)
+        if inputs is None:
+            inputs = summary.free_values
+        used = set(map(get_name_symbolite_object, (*summary.free_values, *inputs)))
+        names = _fresh_names("out", used)
+        outputs = tuple(
+            (expr.__class__ if isinstance(expr, Value) else Real)(next(names))
+            for expr in exprs
+        )
+        used.update(map(get_name_symbolite_object, outputs))
+        lines = list(zip(outputs, exprs))
+
+    temporaries = _fresh_names(prefix, used)
+    content = [
+        line
+        for segment in _segments(lines)
+        for line in _eliminate(segment, temporaries)
+    ]
+    return Block(tuple(inputs), tuple(outputs), tuple(content), name=name)
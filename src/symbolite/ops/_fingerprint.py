@@ -0,0 +1,171 @@
+"""
+symbolite.ops._fingerprint
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Stable digest of symbolic structures.
+
+Unlike `hash`, which is salted per process for strings, a fingerprint
+only depends on the structure of the expression (classes, function
+namespaces and names, value names and exact encodings of literals)
+and therefore can be used as a key for caches shared between processes
+or persisted to disk.
+
+Literals other than builtin scalars, strings, bytes, fractions and
+decimals cannot be fingerprinted unless a `decompose` is registered
+for their type, as their repr might be neither exact nor stable.
+
+:copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from decimal import Decimal
+from fractions import Fraction
+from functools import singledispatch
+from typing import Any
+
+from ..core.function import Function, Operator, UserFunction
+from ..core.symbolite_object import SymboliteObject, get_symbolite_info
+from ..core.value import Name
+
+DIGEST_SIZE = 16
+
+
+def _qualname(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+@singledispatch
+def decompose(obj: Any) -> tuple[str, tuple[Any, ...]]:
+    """Split an object into a stable header and the children to fingerprint.
+
+    Literals are identified by their class and an exact encoding
+    of their value.
+    """
+    raise TypeError(
+        f"Cannot fingerprint objects of type {_qualname(obj.__class__)}, "
+        "register a decompose for it."
+    )
+
+
+@decompose.register(type(None))
+@decompose.register(bool)
+@decompose.register(str)
+def decompose_builtin(obj: None | bool | str) -> tuple[str, tuple[Any, ...]]:
+    return f"{_qualname(obj.__class__)}:{obj}", ()
+
+
+@decompose.register
+def decompose_int(obj: int) -> tuple[str, tuple[Any, ...]]:
+    return f"{_qualname(obj.__class__)}:{int.__repr__(obj)}", ()
+
+
+@decompose.register
+def decompose_float(obj: float) -> tuple[str, tuple[Any, ...]]:
+    return f"{_qualname(obj.__class__)}:{float.hex(obj)}", ()
+
+
+@decompose.register
+def decompose_complex(obj: complex) -> tuple[str, tuple[Any, ...]]:
+    return f"{_qualname(obj.__class__)}:{obj.real.hex()}:{obj.imag.hex()}", ()
+
+
+@decompose.register
+def decompose_bytes(obj: bytes) -> tuple[str, tuple[Any, ...]]:
+    return f"{_qualname(obj.__class__)}:{obj.hex()}", ()
+
+
+@decompose.register
+def decompose_fraction(obj: Fraction) -> tuple[str, tuple[Any, ...]]:
+    return f"{_qualname(obj.__class__)}:{obj.numerator}/{obj.denominator}", ()
+
+
+@decompose.register
+def decompose_decimal(obj: Decimal) -> tuple[str, tuple[Any, ...]]:
+    # The string of a decimal is exact, and keeps its exponent.
+    return f"{_qualname(obj.__class__)}:{obj}", ()
+
+
+@decompose.register(tuple)
+@decompose.register(list)
+def decompose_tuple(obj: tuple[Any, ...] | list[Any]) -> tuple[str, tuple[Any, ...]]:
+    return _qualname(obj.__class__), tuple(obj)
+
+
+@decompose.register
+def decompose_type(obj: type) -> tuple[str, tuple[Any, ...]]:
+    return f"type:{_qualname(obj)}", ()
+
+
+@decompose.register
+def decompose_name(obj: Name) -> tuple[str, tuple[Any, ...]]:
+    return f"name:{obj.namespace}:{obj.name}", ()
+
+
+@decompose.register(SymboliteObject)
+def decompose_symbolite_object(
+    obj: SymboliteObject[Any],
+) -> tuple[str, tuple[Any, ...]]:
+    return _qualname(obj.__class__), (get_symbolite_info(obj),)
+
+
+@decompose.register(Function | Operator | UserFunction)
+def decompose_function(
+    obj: Function[Any] | Operator[Any] | UserFunction[Any, Any, Any],
+) -> tuple[str, tuple[Any, ...]]:
+    # Functions are identified by namespace and name,
+    # as their implementations are not stable across processes.
+    function: SymboliteObject[Any] = obj
+    info = get_symbolite_info(function)
+    return f"{_qualname(obj.__class__)}:{info.namespace}:{info.name}", ()
+
+
+def _digest(header: str, children: list[bytes]) -> bytes:
+    encoded = header.encode("utf-8")
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    h.update(len(encoded).to_bytes(8, "little"))
+    h.update(encoded)
+    h.update(len(children).to_bytes(8, "little"))
+    for child in children:
+        h.update(child)
+    return h.digest()
+
+
+def fingerprint(obj: Any) -> str:
+    """Stable 128 bit digest (as an hexadecimal string) of a symbolic structure.
+
+    The digest is computed bottom-up, and subtrees shared in the
+    expression are only digested once.
+
+    Parameters
+    ----------
+    obj
+        symbolic expression.
+
+    Raises
+    ------
+    TypeError
+        if the expression contains a literal that cannot be fingerprinted.
+    """
+    # Nodes are memoized by identity, and kept alive in the memo
+    # as decompose might create intermediate objects.
+    memo: dict[int, tuple[bytes, Any]] = {}
+    stack: list[tuple[Any, tuple[str, tuple[Any, ...]] | None]] = [(obj, None)]
+    while stack:
+        node, parts = stack.pop()
+        if parts is None:
+            if id(node) in memo:
+                continue
+            parts = decompose(node)
+            if parts[1]:
+                stack.append((node, parts))
+                stack.extend((child, None) for child in parts[1])
+                continue
+        header, children = parts
+        memo[id(node)] = (
+            _digest(header, [memo[id(child)][0] for child in children]),
+            node,
+        )
+    return memo[id(obj)][0].hex()
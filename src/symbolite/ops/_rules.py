@@ -0,0 +1,260 @@
+"""
+symbolite.ops._rules
+~~~~~~~~~~~~~~~~~~~~
+
+Rewrite expressions with a set of pattern based rules.
+
+A rule pattern is an expression in which some values (by default, the
+free values) are wildcards matching any subexpression. Repeated
+wildcards must match equal subexpressions.
+
+Rules are indexed in a discrimination tree: patterns are flattened in
+pre-order into a sequence of keys (functions, named values, literals
+or a wildcard) and inserted in a trie. Retrieving the candidate rules
+for a subexpression only walks as deep as the patterns go, so the cost
+does not grow with the number of rules whose heads do not match.
+
+:copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable
+from typing import Any, NamedTuple
+
+from ..core.call import Call
+from ..core.symbolite_object import get_symbolite_info, structural_eq
+from ..core.value import Name, Value
+from ._substitute import substitute
+from ._visitor import Rewriter
+from .base import free_values
+
+
+class RewriteRule(NamedTuple):
+    """Replace subexpressions matching pattern by replacement.
+
+    Parameters
+    ----------
+    pattern
+        expression of a call (e.g. `real.exp(real.log(a))`).
+    replacement
+        expression in which wildcards are replaced by the matched
+        subexpressions (e.g. `a`).
+    wildcards
+        values of the pattern matching any subexpression.
+        Defaults to the free values of the pattern.
+    """
+
+    pattern: Any
+    replacement: Any
+    wildcards: tuple[Value[Any], ...] | None = None
+
+
+def _unwrap(obj: Any) -> Any:
+    """Content of values wrapping a call or a literal."""
+    while isinstance(obj, Value):
+        value = get_symbolite_info(obj).value
+        if isinstance(value, Name):
+            return obj
+        obj = value
+    return obj
+
+
+def _key(obj: Any) -> tuple[Hashable | None, tuple[Any, ...]]:
+    """Key in the index and children of an (unwrapped) node."""
+    if isinstance(obj, Call):
+        info = get_symbolite_info(obj)
+        if info.kwargs_items:
+            kwnames = tuple(k for k, _ in info.kwargs_items)
+            children = (*info.args, *(v for _, v in info.kwargs_items))
+        else:
+            kwnames, children = (), info.args
+        return ("call", info.func, len(info.args), kwnames), children
+    if isinstance(obj, Value):
+        return ("value", obj), ()
+    try:
+        key = ("literal", obj.__class__, obj)
+        hash(key)
+    except TypeError:
+        return None, ()
+    return key, ()
+
+
+class _Node:
+    """Node of the discrimination tree."""
+
+    __slots__ = ("edges", "wildcard", "rules")
+
+    def __init__(self) -> None:
+        self.edges: dict[Hashable, _Node] = {}
+        self.wildcard: _Node | None = None
+        # (position in the rule set, rule)
+        self.rules: list[tuple[int, RewriteRule]] = []
+
+
+def match(
+    pattern: Any, obj: Any, wildcards: Iterable[Value[Any]]
+) -> dict[Value[Any], Any] | None:
+    """Match an expression against a pattern.
+
+    Parameters
+    ----------
+    pattern
+        pattern expression.
+    obj
+        symbolic expression.
+    wildcards
+        values of the pattern matching any subexpression.
+
+    Returns
+    -------
+    The subexpression matched by each wildcard, or None if there is no match.
+    """
+    wildcards = frozenset(wildcards)
+    bindings: dict[Value[Any], Any] = {}
+    stack = [(pattern, obj)]
+    while stack:
+        pattern, obj = stack.pop()
+        if isinstance(pattern, Value) and pattern in wildcards:
+            if pattern in bindings:
+                if not structural_eq(bindings[pattern], obj):
+                    return None
+            else:
+                bindings[pattern] = obj
+            continue
+        pattern, obj = _unwrap(pattern), _unwrap(obj)
+        if pattern.__class__ is not obj.__class__:
+            return None
+        if isinstance(pattern, Call):
+            pinfo, info = get_symbolite_info(pattern), get_symbolite_info(obj)
+            if (
+                pinfo.func != info.func
+                or len(pinfo.args) != len(info.args)
+                or tuple(k for k, _ in pinfo.kwargs_items)
+                != tuple(k for k, _ in info.kwargs_items)
+            ):
+                return None
+            stack.extend(zip(pinfo.args, info.args))
+            stack.extend(
+                (p, o) for (_, p), (_, o) in zip(pinfo.kwargs_items, info.kwargs_items)
+            )
+        elif not structural_eq(pattern, obj):
+            return None
+    return bindings
+
+
+class _RuleRewriter(Rewriter):
+    def __init__(self, rules: RuleSet) -> None:
+        self.rules = rules
+
+    def rewrite_value(self, obj: Value[Any]) -> Any:
+        return self.rules.apply(obj)
+
+
+class RuleSet:
+    """A set of rewrite rules, indexed to find the applicable ones quickly.
+
+    Parameters
+    ----------
+    rules
+        rewrite rules. When more than one rule matches an expression,
+        the first one is applied.
+    """
+
+    def __init__(self, rules: Iterable[RewriteRule] = ()) -> None:
+        self._root = _Node()
+        self._count = 0
+        for rule in rules:
+            self.add(rule)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, rule: RewriteRule) -> None:
+        """Add a rule (with lower priority than the existing ones)."""
+        values: tuple[Value[Any], ...]
+        if rule.wildcards is None:
+            values = free_values(rule.pattern)
+            rule = rule._replace(wildcards=values)
+        else:
+            values = rule.wildcards
+        wildcards = frozenset(values)
+
+        top = _unwrap(rule.pattern)
+        if not isinstance(top, Call):
+            raise ValueError(f"The pattern of a rule must be a call, not {top!r}")
+
+        node = self._root
+        stack = [rule.pattern]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, Value) and obj in wildcards:
+                if node.wildcard is None:
+                    node.wildcard = _Node()
+                node = node.wildcard
+                continue
+            key, children = _key(_unwrap(obj))
+            if key is None:
+                raise TypeError(f"Unhashable literal {obj!r} in pattern")
+            node = node.edges.setdefault(key, _Node())
+            stack.extend(reversed(children))
+        node.rules.append((self._count, rule))
+        self._count += 1
+
+    def candidates(self, obj: Any) -> list[RewriteRule]:
+        """Rules whose pattern might match the expression, in priority order.
+
+        Repeated wildcards are not checked (see `match`).
+        """
+        found: list[tuple[int, RewriteRule]] = []
+        # Pending subexpressions are kept in a linked list of (head, tail).
+        stack: list[tuple[_Node, Any]] = [(self._root, (obj, None))]
+        while stack:
+            node, pending = stack.pop()
+            if pending is None:
+                found.extend(node.rules)
+                continue
+            head, tail = pending
+            if node.wildcard is not None:
+                stack.append((node.wildcard, tail))
+            if node.edges:
+                key, children = _key(_unwrap(head))
+                if key is None:
+                    continue
+                child = node.edges.get(key)
+                if child is not None:
+                    for item in reversed(children):
+                        tail = (item, tail)
+                    stack.append((child, tail))
+        found.sort(key=lambda item: item[0])
+        return [rule for _, rule in found]
+
+    def apply(self, obj: Any) -> Any:
+        """Apply the first matching rule to the top of an expression.
+
+        Returns the expression unchanged if no rule matches.
+        """
+        for rule in self.candidates(obj):
+            assert rule.wildcards is not None
+            bindings = match(rule.pattern, obj, rule.wildcards)
+            if bindings is not None:
+                return substitute(rule.replacement, bindings)
+        return obj
+
+    def rewrite(self, obj: Any) -> Any:
+        """Apply the rules to an expression in a single bottom-up pass.
+
+        Each subexpression is rewritten after its children, so
+        nested matches (e.g. `exp(log(exp(log(x))))`) are resolved
+        in one pass. Subexpressions created by a replacement are not
+        rewritten again; call this repeatedly to reach a fixed point.
+
+        Parameters
+        ----------
+        obj
+            symbolic expression.
+        """
+        if not self._count:
+            return obj
+        return _RuleRewriter(self).rewrite(obj)
@@ -8,15 +8,17 @@
 :license: BSD, see LICENSE for more details.
 """
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from functools import singledispatch
-from typing import Any
+from typing import Any, overload
 
 from ..abstract.vector import getitem
 from ..core.call import Call
+from ..core.dag import OP_CALL, OP_NAME, OP_VALUE, DAGBuilder, ExpressionDAG
 from ..core.lang import Assign, Block
 from ..core.symbolite_object import get_symbolite_info
 from ..core.value import Name, Value
+from ._traversal import HandlerTable, postorder
 
 
 @singledispatch
@@ -33,31 +35,169 @@ def substitute(obj: Any, replacements: Mapping[Any, Any]) -> Any:
     return replacements.get(obj, obj)
 
 
+_handlers = HandlerTable(substitute)
+
+# Nodes whose children are unchanged are returned as they are (instead of
+# rebuilt), and each call memoizes shared subtrees, so that the cost of a
+# substitution is proportional to the affected region and sharing is kept.
+
+
+def _unchanged(results: list[Any], info: Any) -> bool:
+    nargs = len(info.args)
+    for result, arg in zip(results, info.args):
+        if result is not arg:
+            return False
+    for result, (_, arg) in zip(results[nargs:], info.kwargs_items):
+        if result is not arg:
+            return False
+    return True
+
+
+@_handlers.register(substitute.dispatch(object))
+def _substitute_default(obj: Any, mapper: Mapping[Any, Any]) -> tuple[Any, Any]:
+    return mapper.get(obj, obj), None
+
+
 @substitute.register(Value)
 def substitute_value[R: Value[Any]](obj: R, mapper: Mapping[Any, Any]) -> R:
+    return postorder(obj, _handlers, mapper, memo={})
+
+
+def _combine_value(obj: Value[Any], results: list[Any], mapper: Any) -> Value[Any]:
+    if results[0] is get_symbolite_info(obj).value:
+        return obj
+    return obj.__class__(results[0])
+
+
+@_handlers.register(substitute_value)
+def _substitute_value(obj: Value[Any], mapper: Mapping[Any, Any]) -> tuple[Any, Any]:
     info = get_symbolite_info(obj)
     if isinstance(info.value, Name):
-        return mapper.get(obj, obj)
-    return obj.__class__(substitute(info.value, mapper))
+        return mapper.get(obj, obj), None
+    return (info.value,), _combine_value
 
 
 @substitute.register
 def substitue_call(obj: Call, mapper: Mapping[Any, Any]) -> Call:
+    return postorder(obj, _handlers, mapper, memo={})
+
+
+def _combine_call(obj: Call, results: list[Any], mapper: Mapping[Any, Any]) -> Call:
     info = get_symbolite_info(obj)
     func = mapper.get(info.func, info.func)
-    args = tuple(substitute(arg, mapper) for arg in info.args)
-    kwargs = {k: substitute(arg, mapper) for k, arg in info.kwargs_items}
+    if func is info.func and _unchanged(results, info):
+        return obj
+    nargs = len(info.args)
+    if info.kwargs_items:
+        kwargs = tuple(zip((k for k, _ in info.kwargs_items), results[nargs:]))
+        return Call(func, tuple(results[:nargs]), kwargs)
+    return Call(func, tuple(results), ())
 
-    return Call(func, args, tuple(kwargs.items()))
+
+@_handlers.register(substitue_call)
+def _substitute_call(obj: Call, mapper: Mapping[Any, Any]) -> tuple[Any, Any]:
+    info = get_symbolite_info(obj)
+    if info.kwargs_items:
+        return (*info.args, *(v for _, v in info.kwargs_items)), _combine_call
+    return info.args, _combine_call
 
 
 @substitute.register
 def substitue_assign(obj: Assign, mapper: Mapping[Any, Any]) -> Assign:
+    return postorder(obj, _handlers, mapper, memo={})
+
+
+def _combine_assign(obj: Assign, results: list[Any], mapper: Any) -> Assign:
     info = get_symbolite_info(obj)
-    return Assign(
-        substitute(info.lhs, mapper),
-        substitute(info.rhs, mapper),
-    )
+    if results[0] is info.lhs and results[1] is info.rhs:
+        return obj
+    return Assign(*results)
+
+
+@_handlers.register(substitue_assign)
+def _substitute_assign(obj: Assign, mapper: Mapping[Any, Any]) -> tuple[Any, Any]:
+    info = get_symbolite_info(obj)
+    return (info.lhs, info.rhs), _combine_assign
+
+
+@overload
+def substitute_many[K](  # type: ignore[overload-overlap]
+    exprs: Mapping[K, Any], replacements: Mapping[Any, Any]
+) -> dict[K, Any]: ...
+
+
+@overload
+def substitute_many(  # type: ignore[overload-overlap]
+    exprs: tuple[Any, ...], replacements: Mapping[Any, Any]
+) -> tuple[Any, ...]: ...
+
+
+@overload
+def substitute_many(
+    exprs: Iterable[Any], replacements: Mapping[Any, Any]
+) -> list[Any]: ...
+
+
+def substitute_many(
+    exprs: Mapping[Any, Any] | Iterable[Any], replacements: Mapping[Any, Any]
+) -> dict[Any, Any] | tuple[Any, ...] | list[Any]:
+    """Replace symbols, functions, values, etc by others in many expressions.
+
+    Equivalent to calling substitute on each expression, but the results
+    are memoized across all of them, so subexpressions shared among
+    expressions are substituted once.
+
+    Parameters
+    ----------
+    exprs
+        symbolic expressions, as a mapping (only values are substituted),
+        a tuple or any other iterable (returned as a list).
+    replacements
+        replacement dictionary.
+    """
+    memo: dict[int, tuple[Any, Any]] = {}
+    if isinstance(exprs, Mapping):
+        return {
+            k: postorder(v, _handlers, replacements, memo=memo)
+            for k, v in exprs.items()
+        }
+    out = [postorder(expr, _handlers, replacements, memo=memo) for expr in exprs]
+    if isinstance(exprs, tuple):
+        return tuple(out)
+    return out
+
+
+@substitute.register
+def substitute_dag(obj: ExpressionDAG, mapper: Mapping[Any, Any]) -> ExpressionDAG:
+    builder = DAGBuilder()
+    offsets, children, keywords = obj.offsets, obj.children, obj.keywords
+    # Index of each node in the new DAG.
+    new: list[int] = []
+    for index, (opcode, operand) in enumerate(zip(obj.opcodes, obj.operands)):
+        if opcode == OP_CALL:
+            func = obj.functions[operand]
+            new.append(
+                builder.add_call(
+                    mapper.get(func, func),
+                    (new[c] for c in children[offsets[index] : offsets[index + 1]]),
+                    keywords.get(index, ()),
+                )
+            )
+        elif opcode == OP_NAME:
+            value = obj.names[operand]
+            if value in mapper:
+                new.append(builder.add_expr(mapper[value]))
+            else:
+                new.append(builder.add_name(value))
+        elif opcode == OP_VALUE:
+            new.append(
+                builder.add_value(obj.classes[operand], new[children[offsets[index]]])
+            )
+        else:
+            constant = obj.constants[operand]
+            new.append(builder.add_expr(substitute(constant, mapper)))
+
+    return builder.build(new[-1])
 
 
 def is_vector_item(el: Value[Any]) -> tuple[bool, tuple[Any, ...]]:
@@ -8,20 +8,67 @@
 :license: BSD, see LICENSE for more details.
 """
 
+import itertools
 import types
 from functools import singledispatch
-from operator import attrgetter
 from typing import Any
 
 from ..core import (
     Unsupported,
 )
-from ..core.call import CallInfo
-from ..core.function import FunctionInfo, OperatorInfo, UserFunctionInfo
+from ..core.call import Call, CallInfo
+from ..core.dag import OP_CALL, OP_NAME, OP_VALUE, ExpressionDAG
+from ..core.function import (
+    Function,
+    FunctionInfo,
+    Operator,
+    OperatorInfo,
+    UserFunctionInfo,
+)
 from ..core.lang import Assign, Block
 from ..core.symbolite_object import SymboliteObject, get_symbolite_info
 from ..core.value import Name, Value
 from ._get_name import get_full_name, get_name, get_namespace
+from ._traversal import HandlerTable, postorder
+
+# Attributes of each backend module already resolved,
+# as key -> (namespace module, name, attribute value).
+_resolved: dict[types.ModuleType, dict[Any, tuple[Any, str, Any]]] = {}
+
+
+def resolve(libsl: types.ModuleType, key: Any, namespace: str, name: str) -> Any:
+    """Get the attribute namespace.name of a backend module.
+
+    The result is cached by key for each backend module. Cached entries are
+    checked against the module when used, so they are refreshed if an
+    attribute of the backend is changed.
+
+    Parameters
+    ----------
+    libsl
+        implementation module.
+    key
+        hashable object identifying the attribute (e.g. a function).
+    namespace
+        name of the namespace module within libsl.
+    name
+        name of the attribute within the namespace.
+    """
+    cache = _resolved.get(libsl)
+    if cache is None:
+        cache = _resolved.setdefault(libsl, {})
+    entry = cache.get(key)
+    if entry is not None:
+        container, attr, value = entry
+        if (
+            getattr(libsl, namespace, None) is container
+            and getattr(container, attr, None) is value
+        ):
+            return value
+    container = getattr(libsl, namespace)
+    value = getattr(container, name)
+    cache[key] = (container, name, value)
+    return value
 
 
 @singledispatch
@@ -53,25 +100,87 @@ def translate_builtin_float(obj: float, libsl: types.ModuleType) -> Any:
     return libsl.lang.to_float(obj, libsl)
 
 
+_handlers = HandlerTable(translate)
+
+
+class Translator:
+    """Translate expressions memoizing the translation of each node.
+
+    Nodes are identified by identity, so subexpressions shared within an
+    expression (or among expressions translated with the same Translator)
+    are translated only once. Enable interning to also share structurally
+    equal subexpressions built independently.
+
+    Parameters
+    ----------
+    libsl
+        implementation module.
+    """
+
+    __slots__ = ("libsl", "memo")
+
+    def __init__(self, libsl: types.ModuleType) -> None:
+        self.libsl = libsl
+        self.memo: dict[int, tuple[Any, Any]] = {}
+
+    def __call__(self, obj: Any) -> Any:
+        """Translate expression into backend representation."""
+        return postorder(obj, _handlers, self.libsl, memo=self.memo)
+
+    def clear(self) -> None:
+        """Forget the memoized translations."""
+        self.memo.clear()
+
+
+@_handlers.register(translate.dispatch(object))
+def _translate_default(obj: Any, libsl: types.ModuleType) -> tuple[Any, Any]:
+    return obj, None
+
+
+def _first(obj: Any, results: list[Any], libsl: types.ModuleType) -> Any:
+    return results[0]
+
+
 @translate.register(tuple)
 def translate_tuple(obj: tuple[Any, ...], libsl: types.ModuleType) -> Any:
-    return libsl.lang.to_tuple(tuple(translate(value, libsl) for value in obj), libsl)
+    return postorder(obj, _handlers, libsl)
+
+
+def _combine_tuple(obj: Any, results: list[Any], libsl: types.ModuleType) -> Any:
+    return libsl.lang.to_tuple(tuple(results), libsl)
+
+
+@_handlers.register(translate_tuple)
+def _translate_tuple(obj: tuple[Any, ...], libsl: types.ModuleType) -> tuple[Any, Any]:
+    return obj, _combine_tuple
 
 
 @translate.register(list)
 def translate_list(obj: list[Any], libsl: types.ModuleType) -> Any:
-    return libsl.lang.to_list(tuple(translate(value, libsl) for value in obj), libsl)
+    return postorder(obj, _handlers, libsl)
+
+
+def _combine_list(obj: Any, results: list[Any], libsl: types.ModuleType) -> Any:
+    return libsl.lang.to_list(tuple(results), libsl)
+
+
+@_handlers.register(translate_list)
+def _translate_list(obj: list[Any], libsl: types.ModuleType) -> tuple[Any, Any]:
+    return obj, _combine_list
 
 
 @translate.register(dict)
 def translate_dict(obj: dict[Any, Any], libsl: types.ModuleType) -> Any:
-    return libsl.lang.to_dict(
-        tuple(
-            (translate(key, libsl), translate(value, libsl))
-            for key, value in obj.items()
-        ),
-        libsl,
-    )
+    return postorder(obj, _handlers, libsl)
+
+
+def _combine_dict(obj: Any, results: list[Any], libsl: types.ModuleType) -> Any:
+    return libsl.lang.to_dict(tuple(zip(results[::2], results[1::2])), libsl)
+
+
+@_handlers.register(translate_dict)
+def _translate_dict(obj: dict[Any, Any], libsl: types.ModuleType) -> tuple[Any, Any]:
+    return tuple(itertools.chain.from_iterable(obj.items())), _combine_dict
 
 
 @translate.register
@@ -88,61 +197,92 @@ def translate_block(obj: Block, libsl: types.ModuleType) -> Any:
 def translate_symbolite_object(
     obj: SymboliteObject[Any], libsl: types.ModuleType
 ) -> Any:
-    info = get_symbolite_info(obj)
-    return translate(info, libsl)
+    return postorder(obj, _handlers, libsl)
+
+
+@_handlers.register(translate_symbolite_object)
+def _translate_symbolite_object(
+    obj: SymboliteObject[Any], libsl: types.ModuleType
+) -> tuple[Any, Any]:
+    return (get_symbolite_info(obj),), _first
 
 
 @translate.register(Value)
 def translate_value(obj: Value[Any], libsl: types.ModuleType) -> Any:
-    info = get_symbolite_info(obj)
-    if not isinstance(info.value, Name):
-        # Literal value or Call
-        return translate(info.value, libsl)
+    return postorder(obj, _handlers, libsl)
+
+
+@_handlers.register(translate_value)
+def _translate_value(obj: Value[Any], libsl: types.ModuleType) -> tuple[Any, Any]:
+    value = get_symbolite_info(obj).value
+    if isinstance(value, Name):
+        return _translate_named(obj, value, libsl), None
+    # Literal value or Call
+    return (value,), _first
 
+
+def _translate_named(obj: Value[Any], name: Name, libsl: types.ModuleType) -> Any:
+    info = get_symbolite_info(obj)
     namespace = get_namespace(info)
     if namespace is None or namespace == "":
         # User defined symbol
         # Try to map the class
-        cls_name = f"{obj.__class__.__module__.split('.')[-1]}.{obj.__class__.__name__}"
-
-        cls = attrgetter(cls_name)(libsl)
+        cls = obj.__class__
+        cls = resolve(libsl, cls, cls.__module__.split(".")[-1], cls.__name__)
         if cls is Unsupported:
-            raise Unsupported(f"{cls_name} is not supported in module {libsl.__name__}")
+            raise Unsupported(
+                f"{_qualname(obj.__class__)} is not supported in module {libsl.__name__}"
+            )
 
         return cls(get_name(obj))
     else:
         # Library symbol
-        qname = get_full_name(obj)
-        value = attrgetter(qname)(libsl)
+        value = resolve(libsl, obj, namespace, get_name(name))
 
         if value is Unsupported:
-            raise Unsupported(f"{qname} is not supported in module {libsl.__name__}")
+            raise Unsupported(
+                f"{get_full_name(obj)} is not supported in module {libsl.__name__}"
+            )
 
         return value
 
 
+def _qualname(cls: type) -> str:
+    return f"{cls.__module__.split('.')[-1]}.{cls.__name__}"
+
+
 @translate.register(FunctionInfo)
 def translate_function_info(
     obj: FunctionInfo[Any], libsl: types.ModuleType
 ) -> Any | Unsupported:
-    attr_name = f"{obj.namespace}.{obj.name}"
-    return attrgetter(attr_name)(libsl)
+    return resolve(libsl, obj, obj.namespace, obj.name)
 
 
 @translate.register(OperatorInfo)
 def translate_operator_info(
     obj: OperatorInfo[Any], libsl: types.ModuleType
 ) -> Any | Unsupported:
-    attr_name = f"{obj.namespace}.{obj.name}"
-    return attrgetter(attr_name)(libsl)
+    return resolve(libsl, obj, obj.namespace, obj.name)
 
 
-@translate.register(CallInfo)
-def translate_call_info(obj: CallInfo, libsl: types.ModuleType) -> Any:
-    func = translate(obj.func, libsl)
-    args = tuple(translate(arg, libsl) for arg in obj.args)
-    kwargs = {k: translate(arg, libsl) for k, arg in obj.kwargs_items}
+@translate.register(Function | Operator)
+def translate_function(
+    obj: Function[Any] | Operator[Any], libsl: types.ModuleType
+) -> Any | Unsupported:
+    # Resolved using the function as key, as its hash is cached.
+    function: SymboliteObject[Any] = obj
+    info = get_symbolite_info(function)
+    return resolve(libsl, obj, info.namespace, info.name)
+
+
+@_handlers.register(translate_function)
+def _translate_function(
+    obj: Function[Any] | Operator[Any], libsl: types.ModuleType
+) -> tuple[Any, Any]:
+    return translate_function(obj, libsl), None
 
+
+def _apply(func: Any, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
     try:
         return func(*args, **kwargs)
     except Exception as ex:
@@ -153,6 +293,75 @@ def translate_call_info(obj: CallInfo, libsl: types.ModuleType) -> Any:
         raise ex
 
 
+@translate.register(CallInfo)
+def translate_call_info(obj: CallInfo, libsl: types.ModuleType) -> Any:
+    return postorder(obj, _handlers, libsl)
+
+
+def _combine_call_info(obj: CallInfo, results: list[Any], libsl: Any) -> Any:
+    nargs = len(obj.args)
+    if obj.kwargs_items:
+        kwargs = dict(zip((k for k, _ in obj.kwargs_items), results[1 + nargs :]))
+        return _apply(results[0], tuple(results[1 : 1 + nargs]), kwargs)
+    return _apply(results[0], tuple(results[1:]), {})
+
+
+@_handlers.register(translate_call_info)
+def _translate_call_info(obj: CallInfo, libsl: types.ModuleType) -> tuple[Any, Any]:
+    if obj.kwargs_items:
+        children = (obj.func, *obj.args, *(v for _, v in obj.kwargs_items))
+    else:
+        children = (obj.func, *obj.args)
+    return children, _combine_call_info
+
+
+@translate.register
+def translate_call(obj: Call, libsl: types.ModuleType) -> Any:
+    return postorder(obj, _handlers, libsl)
+
+
+def _combine_call(obj: Call, results: list[Any], libsl: Any) -> Any:
+    return _combine_call_info(get_symbolite_info(obj), results, libsl)
+
+
+@_handlers.register(translate_call)
+def _translate_call(obj: Call, libsl: types.ModuleType) -> tuple[Any, Any]:
+    children, _ = _translate_call_info(get_symbolite_info(obj), libsl)
+    return children, _combine_call
+
+
+@translate.register
+def translate_dag(obj: ExpressionDAG, libsl: types.ModuleType) -> Any:
+    # Each function, name and constant is translated once,
+    # and each node is evaluated once in topological order.
+    functions = [translate(func, libsl) for func in obj.functions]
+    names = [translate(value, libsl) for value in obj.names]
+    constants = [translate(constant, libsl) for constant in obj.constants]
+
+    offsets, children, keywords = obj.offsets, obj.children, obj.keywords
+    out: list[Any] = []
+    for index, (opcode, operand) in enumerate(zip(obj.opcodes, obj.operands)):
+        if opcode == OP_CALL:
+            args = tuple(out[c] for c in children[offsets[index] : offsets[index + 1]])
+            kwnames = keywords.get(index)
+            if kwnames:
+                npos = len(args) - len(kwnames)
+                out.append(
+                    _apply(
+                        functions[operand], args[:npos], dict(zip(kwnames, args[npos:]))
+                    )
+                )
+            else:
+                out.append(_apply(functions[operand], args, {}))
+        elif opcode == OP_NAME:
+            out.append(names[operand])
+        elif opcode == OP_VALUE:
+            out.append(out[children[offsets[index]]])
+        else:
+            out.append(constants[operand])
+    return out[-1]
+
+
 @translate.register(UserFunctionInfo)
 def translate_user_function_info(
     obj: UserFunctionInfo[Any, Any, Any], libsl: types.ModuleType
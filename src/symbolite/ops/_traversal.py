@@ -0,0 +1,171 @@
+"""
+symbolite.ops._traversal
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Non recursive traversal of symbolic structures.
+
+Operations are singledispatch functions. To avoid recursing over deep
+expressions, the implementations for structural types (values, calls,
+containers) are paired with handlers in a HandlerTable, and the walkers
+below use an explicit stack calling the handler of each node:
+
+- postorder: computes a result bottom-up (e.g. translate, substitute).
+  Handlers return (children, combine) and, once the children have been
+  processed, combine(node, results, *args) gives the result of the node.
+  If combine is None, the node is a leaf and children is its result.
+
+- preorder: yields items top-down (e.g. yield_named, tree_view).
+  Handlers return (items, children): items are yielded before the
+  children are visited.
+
+Handlers are associated with implementations (and not with types), so
+the implementation that would be dispatched for a node decides how it
+is traversed. Nodes whose implementation has no handler (e.g. those
+registered by users) are given to that implementation.
+
+:copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Generator
+from typing import Any
+
+type Handler = Callable[..., tuple[Any, Any]]
+
+
+class HandlerTable:
+    """Handlers of the implementations of a singledispatch operation.
+
+    Parameters
+    ----------
+    func
+        singledispatch function.
+    fallback
+        handler for nodes whose implementation has no handler.
+        By default, the walker calls the dispatched implementation.
+    """
+
+    __slots__ = ("func", "fallback", "handlers")
+
+    def __init__(self, func: Any, fallback: Handler | None = None) -> None:
+        self.func = func
+        self.fallback = fallback
+        self.handlers: dict[Callable[..., Any], Handler] = {}
+
+    def register(self, impl: Callable[..., Any]) -> Callable[[Handler], Handler]:
+        """Register a handler for a given implementation of the operation."""
+
+        def _register(handler: Handler) -> Handler:
+            self.handlers[impl] = handler
+            return handler
+
+        return _register
+
+    def get(self, cls: type) -> tuple[Callable[..., Any], Handler | None]:
+        """Implementation and handler (or the fallback) for a given type."""
+        impl = self.func.dispatch(cls)
+        return impl, self.handlers.get(impl, self.fallback)
+
+
+# Marks that the entry below in the stack is (node, combine, number of children).
+_COMBINE = object()
+
+
+def postorder(
+    obj: Any,
+    table: HandlerTable,
+    *args: Any,
+    memo: dict[int, tuple[Any, Any]] | None = None,
+) -> Any:
+    """Compute the result of an operation bottom-up, without recursion.
+
+    Parameters
+    ----------
+    obj
+        symbolic structure.
+    table
+        handlers of the operation.
+    *args
+        extra arguments given to the handlers.
+    memo
+        if given, results are stored by node identity (together with the node,
+        to keep it alive) and nodes already in it are not processed again.
+    """
+    # Dispatch is resolved once per type and walk.
+    lookup: dict[type, tuple[Callable[..., Any], Handler | None]] = {}
+    results: list[Any] = []
+    stack: list[Any] = [obj]
+    while stack:
+        node = stack.pop()
+        if node is _COMBINE:
+            node, combine, count = stack.pop()
+            values = results[-count:]
+            del results[-count:]
+            result = combine(node, values, *args)
+            results.append(result)
+            if memo is not None:
+                memo[id(node)] = (node, result)
+            continue
+        if memo is not None:
+            hit = memo.get(id(node))
+            if hit is not None:
+                results.append(hit[1])
+                continue
+        cls = node.__class__
+        impl, handler = lookup.get(cls) or lookup.setdefault(cls, table.get(cls))
+        if handler is None:
+            result = impl(node, *args)
+        else:
+            children, combine = handler(node, *args)
+            if combine is None:
+                result = children
+            elif children:
+                stack.append((node, combine, len(children)))
+                stack.append(_COMBINE)
+                stack.extend(reversed(children))
+                continue
+            else:
+                result = combine(node, [], *args)
+        results.append(result)
+        if memo is not None:
+            memo[id(node)] = (node, result)
+    return results[0]
+
+
+def preorder(
+    obj: Any, table: HandlerTable, *args: Any, seen: set[int] | None = None
+) -> Generator[Any, None, None]:
+    """Yield the items of an operation top-down, without recursion.
+
+    Parameters
+    ----------
+    obj
+        symbolic structure.
+    table
+        handlers of the operation.
+    *args
+        extra arguments given to the handlers.
+    seen
+        if given, identities of visited nodes are added to it and nodes
+        already in it are skipped (e.g. to visit shared subtrees once).
+        obj must keep the nodes alive while walking.
+    """
+    # Dispatch is resolved once per type and walk.
+    lookup: dict[type, tuple[Callable[..., Any], Handler | None]] = {}
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if seen is not None:
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+        cls = node.__class__
+        impl, handler = lookup.get(cls) or lookup.setdefault(cls, table.get(cls))
+        if handler is None:
+            yield from impl(node, *args)
+            continue
+        items, children = handler(node, *args)
+        yield from items
+        stack.extend(reversed(children))
@@ -4,6 +4,11 @@
 
 Visualize symbolic structures.
 
+The tree view is produced iteratively and written to the target file
+in chunks, so that huge or deep expressions can be printed. Use the
+options of Printer to elide deep or long expressions and to print
+shared subexpressions once.
+
 :copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
 :license: BSD, see LICENSE for more details.
 """
@@ -11,14 +16,16 @@
 import itertools
 import sys
 from functools import singledispatch
-from typing import Any, Protocol, TypeVar
+from typing import Any, NamedTuple, Protocol, TypeVar
 
 from ..core import Value
 from ..core.call import CallInfo
 from ..core.function import FunctionInfo, OperatorInfo
 from ..core.symbolite_object import SymboliteObject, get_symbolite_info
 from ..core.value import Name
-from ..ops._get_name import get_full_name
+from ._get_name import get_full_name
+from ._traversal import HandlerTable, preorder
+from ._visitor import Visitor
 
 _T_contra = TypeVar("_T_contra", contravariant=True)
 
@@ -28,94 +35,280 @@ def write(self, s: _T_contra, /) -> object: ...
 
 
 class Printer:
+    """Write the tree view of a symbolic structure to a file.
+
+    Lines are accumulated and written in chunks of (at least) chunk_size
+    characters, and when the printer is flushed or closed.
+
+    Parameters
+    ----------
+    file
+        target file, defaults to sys.stdout.
+    indent_width
+        number of spaces per indentation level.
+    max_depth
+        values wrapping calls nested deeper than this are printed as `...`.
+    max_nodes
+        values after the first max_nodes are printed as `...`.
+    shared
+        if True, subexpressions appearing more than once are printed once,
+        prefixed with a label (e.g. `#1 = `), and referred to by the label.
+    chunk_size
+        minimum number of characters written at once.
+    """
+
     file: SupportsWrite[str]
     indent_level: int = 0
     indent_width: int
     _current_line: list[str]
 
     def __init__(
-        self, file: SupportsWrite[str] | None = None, indent_width: int = 2
+        self,
+        file: SupportsWrite[str] | None = None,
+        indent_width: int = 2,
+        *,
+        max_depth: int | None = None,
+        max_nodes: int | None = None,
+        shared: bool = False,
+        chunk_size: int = 1 << 16,
     ) -> None:
         self.file = file or sys.stdout
         self.indent_width = indent_width
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.shared = shared
+        self.chunk_size = chunk_size
+        self.node_count = 0
         self._current_line = []
+        self._chunk: list[str] = []
+        self._chunk_length = 0
+        # Identities of the shared subexpressions and their labels,
+        # set while walking an expression.
+        self._shared_ids: set[int] | None = None
+        self._labels: dict[int, int] = {}
 
     def append(self, value: str):
         self._current_line.append(value)
 
-    def flush_line(self):
-        self.file.write(
+    def end_line(self):
+        """Terminate the current line (which is written with the next chunk)."""
+        line = (
             " " * self.indent_width * self.indent_level
             + "".join(self._current_line)
             + "\n"
         )
         self._current_line = []
+        self._chunk.append(line)
+        self._chunk_length += len(line)
+        if self._chunk_length >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Write the terminated lines."""
+        if self._chunk:
+            self.file.write("".join(self._chunk))
+            self._chunk = []
+            self._chunk_length = 0
+
+    def flush_line(self):
+        self.end_line()
+        self.flush()
 
     def indent(self):
-        self.flush_line()
+        self.end_line()
         self.indent_level += 1
 
     def dedent(self):
-        self.flush_line()
+        self.end_line()
         self.indent_level -= 1
 
+    def close(self):
+        """Terminate the current line (if not empty) and write all lines."""
+        if self._current_line:
+            self.end_line()
+        self.flush()
+
     def __del__(self):
-        self.flush_line()
+        self.close()
+
+    def elide(self, is_call: bool) -> bool:
+        """True if the next value must be printed as `...`.
+
+        Otherwise, the value is counted towards max_nodes.
+        """
+        if (
+            is_call
+            and self.max_depth is not None
+            and self.indent_level >= self.max_depth
+        ):
+            return True
+        if self.max_nodes is not None and self.node_count >= self.max_nodes:
+            return True
+        self.node_count += 1
+        return False
 
 
 def _default_printer() -> Printer:
     return Printer()
 
 
+class _Print(NamedTuple):
+    """Instruction for the printer (i.e. method name and arguments)."""
+
+    method: str
+    args: tuple[str, ...] = ()
+
+
+_INDENT = _Print("indent")
+_DEDENT = _Print("dedent")
+_FLUSH = _Print("end_line")
+_COMMA = _Print("append", (",",))
+_ELLIPSIS = _Print("append", ("...",))
+
+
+def _append(value: str) -> _Print:
+    return _Print("append", (value,))
+
+
+class _SharedFinder(Visitor):
+    """Find the values (wrapping a call) reached more than once."""
+
+    def __init__(self) -> None:
+        self.seen: set[int] = set()
+        self.shared: set[int] = set()
+
+    def visit_value(self, obj: Value[Any]) -> bool:
+        if id(obj) in self.seen:
+            self.shared.add(id(obj))
+            return False
+        self.seen.add(id(obj))
+        return True
+
+
+def _walk(obj: Any, pretty_printer: Printer | None) -> None:
+    if pretty_printer is None:
+        pretty_printer = _default_printer()
+        _walk(obj, pretty_printer)
+        pretty_printer.close()
+        return
+
+    # Implementations without handler might start nested walks.
+    outermost = pretty_printer._shared_ids is None
+    if outermost:
+        if pretty_printer.shared:
+            finder = _SharedFinder()
+            finder.visit(obj)
+            pretty_printer._shared_ids = finder.shared
+        else:
+            pretty_printer._shared_ids = set()
+    try:
+        for instruction in preorder(obj, _handlers, pretty_printer):
+            getattr(pretty_printer, instruction.method)(*instruction.args)
+    finally:
+        if outermost:
+            pretty_printer._shared_ids = None
+            pretty_printer._labels = {}
+            pretty_printer.node_count = 0
+            pretty_printer.flush()
+
+
 @singledispatch
 def tree_view(obj: Any, pretty_printer: Printer | None = None):
-    pretty_printer = pretty_printer or _default_printer()
-    pretty_printer.append(str(obj))
+    _walk(obj, pretty_printer)
+
+
+def _tree_view_fallback(obj: Any, pretty_printer: Printer) -> tuple[Any, Any]:
+    # Implementations without handler write directly to the printer,
+    # which is up to date as instructions are consumed while walking.
+    tree_view(obj, pretty_printer)
+    return (), ()
+
+
+_handlers = HandlerTable(tree_view, _tree_view_fallback)
+
+
+@_handlers.register(tree_view.dispatch(object))
+def _tree_view_default(obj: Any, pretty_printer: Printer) -> tuple[Any, Any]:
+    return (_append(str(obj)),), ()
+
+
+@tree_view.register
+def tree_view_print(obj: _Print, pretty_printer: Printer | None = None):
+    _walk(obj, pretty_printer)
+
+
+@_handlers.register(tree_view_print)
+def _tree_view_print(obj: _Print, pretty_printer: Printer) -> tuple[Any, Any]:
+    return (obj,), ()
 
 
 @tree_view.register(SymboliteObject)
 def tree_view_symbolite_object(
     obj: SymboliteObject[Any], pretty_printer: Printer | None = None
 ):
-    pretty_printer = pretty_printer or _default_printer()
-    info = get_symbolite_info(obj)
-    tree_view(info, pretty_printer)
+    _walk(obj, pretty_printer)
+
+
+@_handlers.register(tree_view_symbolite_object)
+def _tree_view_symbolite_object(
+    obj: SymboliteObject[Any], pretty_printer: Printer
+) -> tuple[Any, Any]:
+    return (), (get_symbolite_info(obj),)
 
 
 @tree_view.register(FunctionInfo | OperatorInfo)
 def tree_view_function(
     obj: FunctionInfo[Any] | OperatorInfo[Any], pretty_printer: Printer | None = None
 ):
-    pretty_printer = pretty_printer or _default_printer()
-    pretty_printer.append(f"{obj.namespace}.{obj.name}")
+    _walk(obj, pretty_printer)
+
+
+@_handlers.register(tree_view_function)
+def _tree_view_function(
+    obj: FunctionInfo[Any] | OperatorInfo[Any], pretty_printer: Printer
+) -> tuple[Any, Any]:
+    return (_append(f"{obj.namespace}.{obj.name}"),), ()
 
 
 @tree_view.register
 def tree_view_call(obj: CallInfo, pretty_printer: Printer | None = None):
-    pretty_printer = pretty_printer or _default_printer()
-    tree_view(obj.func, pretty_printer)
-    pretty_printer.append("(")
-    pretty_printer.indent()
+    _walk(obj, pretty_printer)
+
 
+@_handlers.register(tree_view_call)
+def _tree_view_call(obj: CallInfo, pretty_printer: Printer) -> tuple[Any, Any]:
+    children: list[Any] = [obj.func, _append("("), _INDENT]
     for ndx, (k, v) in enumerate(
         itertools.chain(map(lambda arg: (None, arg), obj.args), obj.kwargs_items)
     ):
+        if ndx:
+            children.extend((_COMMA, _FLUSH))
         if k is not None:
-            pretty_printer.append(f"{k} = ")
-        tree_view(v, pretty_printer)
-        if ndx < len(obj.args) + len(obj.kwargs_items) - 1:
-            pretty_printer.append(",")
-            pretty_printer.flush_line()
-    pretty_printer.dedent()
-    pretty_printer.append(")")
+            children.append(_append(f"{k} = "))
+        children.append(v)
+    children.extend((_DEDENT, _append(")")))
+    return (), children
 
 
 @tree_view.register(Value)
 def tree_view_value(obj: Value[Any], pretty_printer: Printer | None = None):
-    pretty_printer = pretty_printer or _default_printer()
-    info = get_symbolite_info(obj)
-    if isinstance(info.value, Name):
-        pretty_printer.append(get_full_name(info.value))
-    else:
-        pretty_printer.append(f"{obj.__class__.__name__}#")
-        tree_view(info.value, pretty_printer)
+    _walk(obj, pretty_printer)
+
+
+@_handlers.register(tree_view_value)
+def _tree_view_value(obj: Value[Any], pretty_printer: Printer) -> tuple[Any, Any]:
+    value = get_symbolite_info(obj).value
+    if pretty_printer.elide(not isinstance(value, Name)):
+        return (_ELLIPSIS,), ()
+    if isinstance(value, Name):
+        return (_append(get_full_name(value)),), ()
+    head = f"{obj.__class__.__name__}#"
+    shared_ids = pretty_printer._shared_ids
+    if shared_ids and id(obj) in shared_ids:
+        labels = pretty_printer._labels
+        label = labels.get(id(obj))
+        if label is not None:
+            return (_append(f"#{label}"),), ()
+        label = labels[id(obj)] = len(labels) + 1
+        head = f"#{label} = {head}"
+    return (_append(head),), (value,)
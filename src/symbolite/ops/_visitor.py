@@ -0,0 +1,307 @@
+"""
+symbolite.ops._visitor
+~~~~~~~~~~~~~~~~~~~~~~
+
+Base classes to write passes over symbolic structures.
+
+Subclasses of Visitor and Rewriter override hooks for each kind of node
+(value, call, function, operator, block, assign, container and other). The hook
+and the way to reach the children of each concrete node class are
+resolved once per subclass and stored in a flat table, so that the
+cost of dispatching a node is a dictionary lookup.
+
+:copyright: 2023 by Symbolite Authors, see AUTHORS for more details.
+:license: BSD, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, ClassVar
+
+from ..core.call import Call
+from ..core.function import Function, Operator, UserFunction
+from ..core.lang import Assign, Block
+from ..core.symbolite_object import get_symbolite_info
+from ..core.value import Name, Value
+
+# Kind of node for each base class (checked in order).
+_KINDS: tuple[tuple[type, str], ...] = (
+    (Value, "value"),
+    (Call, "call"),
+    (Function, "function"),
+    (UserFunction, "function"),
+    (Operator, "operator"),
+    (Block, "block"),
+    (Assign, "assign"),
+)
+
+
+def node_kind(cls: type) -> str:
+    """Kind of node of a given class, used to select the hook."""
+    for base, kind in _KINDS:
+        if issubclass(cls, base):
+            return kind
+    if cls is tuple or cls is list:
+        return "container"
+    return "other"
+
+
+def _children_value(obj: Value[Any]) -> tuple[Any, ...]:
+    value = get_symbolite_info(obj).value
+    if isinstance(value, Name):
+        return ()
+    return (value,)
+
+
+def _children_call(obj: Call) -> tuple[Any, ...]:
+    info = get_symbolite_info(obj)
+    if info.kwargs_items:
+        return (info.func, *info.args, *(v for _, v in info.kwargs_items))
+    return (info.func, *info.args)
+
+
+def _children_block(obj: Block) -> tuple[Any, ...]:
+    info = get_symbolite_info(obj)
+    return (*info.inputs, *info.outputs, *info.lines)
+
+
+def _children_assign(obj: Assign) -> tuple[Any, ...]:
+    info = get_symbolite_info(obj)
+    return (info.lhs, info.rhs)
+
+
+def _no_children(obj: Any) -> tuple[Any, ...]:
+    return ()
+
+
+_CHILDREN: dict[str, Callable[[Any], tuple[Any, ...]]] = {
+    "value": _children_value,
+    "call": _children_call,
+    "block": _children_block,
+    "assign": _children_assign,
+    "container": tuple,
+}
+
+
+def _rebuild_value(obj: Value[Any], children: list[Any]) -> Value[Any]:
+    return obj.__class__(children[0])
+
+
+def _rebuild_call(obj: Call, children: list[Any]) -> Call:
+    info = get_symbolite_info(obj)
+    nargs = len(info.args) + 1
+    kwargs = tuple(zip((k for k, _ in info.kwargs_items), children[nargs:]))
+    return Call(children[0], tuple(children[1:nargs]), kwargs)
+
+
+def _rebuild_block(obj: Block, children: list[Any]) -> Block:
+    info = get_symbolite_info(obj)
+    ninputs, noutputs = len(info.inputs), len(info.outputs)
+    return Block(
+        tuple(children[:ninputs]),
+        tuple(children[ninputs : ninputs + noutputs]),
+        tuple(children[ninputs + noutputs :]),
+        name=info.name,
+    )
+
+
+def _rebuild_assign(obj: Assign, children: list[Any]) -> Assign:
+    return Assign(*children)
+
+
+def _rebuild_container(obj: tuple[Any, ...] | list[Any], children: list[Any]) -> Any:
+    return obj.__class__(children)
+
+
+_REBUILD: dict[str, Callable[[Any, list[Any]], Any]] = {
+    "value": _rebuild_value,
+    "call": _rebuild_call,
+    "block": _rebuild_block,
+    "assign": _rebuild_assign,
+    "container": _rebuild_container,
+}
+
+
+class Visitor:
+    """Visit every node of a symbolic structure, top-down and without recursion.
+
+    Override the hooks (visit_value, visit_call, visit_function,
+    visit_operator, visit_block, visit_assign, visit_container,
+    visit_other) to act on each kind of node. If a hook returns False, the children of the node
+    are not visited.
+    """
+
+    # Concrete node class -> (hook, children).
+    _table: ClassVar[dict[type, tuple[Callable[..., Any], Callable[[Any], Any]]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._table = {}
+
+    @classmethod
+    def _resolve(
+        cls, node_cls: type
+    ) -> tuple[Callable[..., Any], Callable[[Any], Any]]:
+        kind = node_kind(node_cls)
+        hook = getattr(cls, f"visit_{kind}", cls.visit_other)
+        entry = cls._table[node_cls] = (hook, _CHILDREN.get(kind, _no_children))
+        return entry
+
+    def visit(self, obj: Any, *, unique: bool = False) -> None:
+        """Visit a symbolic structure.
+
+        Parameters
+        ----------
+        obj
+            symbolic structure.
+        unique
+            if True, nodes shared in the structure are visited once.
+        """
+        table, resolve = self._table, self._resolve
+        seen: set[int] = set()
+        stack = [obj]
+        while stack:
+            node = stack.pop()
+            if unique:
+                if id(node) in seen:
+                    continue
+                seen.add(id(node))
+            cls = node.__class__
+            hook, children = table.get(cls) or resolve(cls)
+            if hook(self, node) is False:
+                continue
+            stack.extend(reversed(children(node)))
+
+    def visit_value(self, obj: Value[Any]) -> bool | None:
+        return None
+
+    def visit_call(self, obj: Call) -> bool | None:
+        return None
+
+    def visit_function(
+        self, obj: Function[Any] | UserFunction[Any, Any, Any]
+    ) -> bool | None:
+        return None
+
+    def visit_operator(self, obj: Operator[Any]) -> bool | None:
+        return None
+
+    def visit_block(self, obj: Block) -> bool | None:
+        return None
+
+    def visit_assign(self, obj: Assign) -> bool | None:
+        return None
+
+    def visit_container(self, obj: tuple[Any, ...] | list[Any]) -> bool | None:
+        return None
+
+    def visit_other(self, obj: Any) -> bool | None:
+        return None
+
+
+class Rewriter:
+    """Rewrite a symbolic structure, bottom-up and without recursion.
+
+    Override the hooks (rewrite_value, rewrite_call, rewrite_function,
+    rewrite_operator, rewrite_block, rewrite_assign, rewrite_container,
+    rewrite_other) to return a replacement for each kind of node. Hooks receive nodes whose
+    children have already been rewritten. Nodes whose children did not
+    change are given as they are (not rebuilt), and shared subtrees are
+    rewritten once.
+    """
+
+    # Concrete node class -> (hook, children, rebuild).
+    _table: ClassVar[
+        dict[
+            type,
+            tuple[Callable[..., Any], Callable[[Any], Any], Callable[..., Any] | None],
+        ]
+    ] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._table = {}
+
+    @classmethod
+    def _resolve(
+        cls, node_cls: type
+    ) -> tuple[Callable[..., Any], Callable[[Any], Any], Callable[..., Any] | None]:
+        kind = node_kind(node_cls)
+        hook = getattr(cls, f"rewrite_{kind}", cls.rewrite_other)
+        entry = cls._table[node_cls] = (
+            hook,
+            _CHILDREN.get(kind, _no_children),
+            _REBUILD.get(kind),
+        )
+        return entry
+
+    def rewrite(self, obj: Any) -> Any:
+        """Rewrite a symbolic structure.
+
+        Parameters
+        ----------
+        obj
+            symbolic structure.
+        """
+        table, resolve = self._table, self._resolve
+        # Results by node identity (with the node, to keep it alive).
+        memo: dict[int, tuple[Any, Any]] = {}
+        results: list[Any] = []
+        stack: list[tuple[Any, tuple[Any, ...] | None]] = [(obj, None)]
+        while stack:
+            node, children = stack.pop()
+            if children is None:
+                hit = memo.get(id(node))
+                if hit is not None:
+                    results.append(hit[1])
+                    continue
+                cls = node.__class__
+                hook, get_children, rebuild = table.get(cls) or resolve(cls)
+                children = get_children(node)
+                if children:
+                    stack.append((node, children))
+                    stack.extend((child, None) for child in reversed(children))
+                    continue
+                result = hook(self, node)
+            else:
+                count = len(children)
+                new = results[-count:]
+                del results[-count:]
+                cls = node.__class__
+                hook, _, rebuild = table.get(cls) or resolve(cls)
+                if rebuild is not None and any(
+                    a is not b for a, b in zip(new, children)
+                ):
+                    result = hook(self, rebuild(node, new))
+                else:
+                    result = hook(self, node)
+            results.append(result)
+            # Keyed by the original node, which is the one found again
+            # when it is shared.
+            memo[id(node)] = (node, result)
+        return results[0]
+
+    def rewrite_value(self, obj: Value[Any]) -> Any:
+        return obj
+
+    def rewrite_call(self, obj: Call) -> Any:
+        return obj
+
+    def rewrite_function(self, obj: Function[Any] | UserFunction[Any, Any, Any]) -> Any:
+        return obj
+
+    def rewrite_operator(self, obj: Operator[Any]) -> Any:
+        return obj
+
+    def rewrite_block(self, obj: Block) -> Any:
+        return obj
+
+    def rewrite_assign(self, obj: Assign) -> Any:
+        return obj
+
+    def rewrite_container(self, obj: tuple[Any, ...] | list[Any]) -> Any:
+        return obj
+
+    def rewrite_other(self, obj: Any) -> Any:
+        return obj
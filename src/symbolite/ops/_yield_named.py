@@ -17,9 +17,11 @@
     Function,
     Value,
 )
+from ..core.dag import OP_CALL, OP_CONSTANT, OP_NAME, ExpressionDAG
 from ..core.function import Operator, UserFunction
 from ..core.symbolite_object import SymboliteObject, get_symbolite_info
 from ..core.value import Name
+from ._traversal import HandlerTable, preorder
 
 
 @singledispatch
@@ -29,30 +31,50 @@ def yield_named(obj: Any) -> Generator[SymboliteObject[Any], None, None]:
     yield SymboliteObject()  # This is required to make it a generator.
 
 
+_handlers = HandlerTable(yield_named)
+
+
+@_handlers.register(yield_named.dispatch(object))
+def _yield_named_default(obj: Any) -> tuple[Any, Any]:
+    return (), ()
+
+
 @yield_named.register(tuple)
 @yield_named.register(list)
 def yield_named_tuple(obj: tuple[Any]) -> Generator[SymboliteObject[Any], None, None]:
-    for el in obj:
-        yield from yield_named(el)
+    return preorder(obj, _handlers)
+
+
+@_handlers.register(yield_named_tuple)
+def _yield_named_tuple(obj: tuple[Any]) -> tuple[Any, Any]:
+    return (), obj
 
 
 @yield_named.register(SymboliteObject)
 def yield_named_symbolite_object(
     obj: SymboliteObject[Any],
 ) -> Generator[SymboliteObject[Any], None, None]:
-    info = get_symbolite_info(obj)
-    yield from yield_named(info)
+    return preorder(obj, _handlers)
+
+
+@_handlers.register(yield_named_symbolite_object)
+def _yield_named_symbolite_object(obj: SymboliteObject[Any]) -> tuple[Any, Any]:
+    return (), (get_symbolite_info(obj),)
 
 
 @yield_named.register(Value)
 def yield_named_value(
     obj: Value[Any],
 ) -> Generator[SymboliteObject[Any], None, None]:
-    info = get_symbolite_info(obj)
-    if isinstance(info.value, Name):
-        yield obj
-    else:
-        yield from yield_named(info.value)
+    return preorder(obj, _handlers)
+
+
+@_handlers.register(yield_named_value)
+def _yield_named_value(obj: Value[Any]) -> tuple[Any, Any]:
+    value = get_symbolite_info(obj).value
+    if isinstance(value, Name):
+        return (obj,), ()
+    return (), (value,)
 
 
 @yield_named.register(Function | Operator | UserFunction)
@@ -62,12 +84,43 @@ def yield_named_base_function(
     yield obj
 
 
+@_handlers.register(yield_named_base_function)
+def _yield_named_base_function(obj: SymboliteObject[Any]) -> tuple[Any, Any]:
+    return (obj,), ()
+
+
 @yield_named.register
 def yield_named_call(obj: Call) -> Generator[SymboliteObject[Any], None, None]:
+    return preorder(obj, _handlers)
+
+
+@_handlers.register(yield_named_call)
+def _yield_named_call(obj: Call) -> tuple[Any, Any]:
     info = get_symbolite_info(obj)
-    yield from yield_named(info.func)
-    for arg in info.args:
-        yield from yield_named(arg)
+    if info.kwargs_items:
+        return (), (info.func, *info.args, *(v for _, v in info.kwargs_items))
+    return (), (info.func, *info.args)
+
 
-    for _, v in info.kwargs_items:
-        yield from yield_named(v)
+@yield_named.register
+def yield_named_dag(
+    obj: ExpressionDAG,
+) -> Generator[SymboliteObject[Any], None, None]:
+    # Shared nodes are yielded as many times as they appear in the expression,
+    # but nodes are visited in topological order (children before parents).
+    for index, count in enumerate(obj.multiplicities()):
+        if not count:
+            continue
+        opcode, operand = obj.opcodes[index], obj.operands[index]
+        if opcode == OP_NAME:
+            named = obj.names[operand]
+            for _ in range(count):
+                yield named
+        elif opcode == OP_CALL:
+            func = obj.functions[operand]
+            for _ in range(count):
+                yield from yield_named(func)
+        elif opcode == OP_CONSTANT:
+            constant = obj.constants[operand]
+            for _ in range(count):
+                yield from yield_named(constant)
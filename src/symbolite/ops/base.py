@@ -10,7 +10,6 @@
 
 from __future__ import annotations
 
-import collections
 import types
 import warnings
 from collections.abc import Callable
@@ -30,9 +29,9 @@ def count_named(obj: Any) -> dict[Any, int]:
     obj
         symbolic expression.
     """
-    from . import yield_named
+    from ._analyze import analyze
 
-    cnt = collections.Counter[Any](yield_named(obj))
+    cnt = analyze(obj).counts
     if cnt:
         return dict(cnt)
     return {obj: 1}
@@ -75,15 +74,34 @@ def is_free_value(obj: Any) -> bool:
     return isinstance(info.value, Name) and info.value.namespace == ""
 
 
+def unique_named(obj: Any) -> tuple[Any, ...]:
+    """Named structures inside an expression, without repetition,
+    in order of first appearance.
+
+    The result is cached in symbolite objects (see analyze).
+
+    Parameters
+    ----------
+    obj
+        symbolic expression.
+    """
+    from ._analyze import analyze
+
+    return analyze(obj).named
+
+
 def free_values(obj: Any) -> tuple[Value[Any], ...]:
-    from . import yield_named
+    """User defined values (i.e. without namespace) inside an expression,
+    without repetition, in order of first appearance.
 
-    seen: list[Any] = []
-    for el in filter(is_free_value, yield_named(obj)):
-        if el not in seen:
-            seen.append(el)
+    Parameters
+    ----------
+    obj
+        symbolic expression.
+    """
+    from ._analyze import analyze
 
-    return tuple(seen)
+    return analyze(obj).free_values
 
 
 def compare_namespace(namespace: str) -> Callable[[Any], bool]:
@@ -103,11 +121,9 @@ def value_names(self: Any, namespace: str | None = "") -> set[str]:
         If a string, will compare valu.namespace to that.
         Defaults to "" which is the namespace for user defined values.
     """
-    from . import yield_named
-
     if namespace is None:
-        return set(map(get_full_name, yield_named(self)))
+        return set(map(get_full_name, unique_named(self)))
     else:
         return set(
-            map(get_full_name, filter(compare_namespace(namespace), yield_named(self)))
+            map(get_full_name, filter(compare_namespace(namespace), unique_named(self)))
         )
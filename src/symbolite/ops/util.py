@@ -10,24 +10,114 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Hashable, Iterator, Mapping
-from types import ModuleType
+import importlib
+import itertools
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor
+from types import MappingProxyType, ModuleType
 from typing import Any
 
+from ._analyze import analyze
 from ._translate import translate
-from .base import count_named
+
+
+class CyclicDependencyError(ValueError):
+    """Cyclic dependencies found while solving a dependency graph.
+
+    Attributes
+    ----------
+    remaining
+        items that could not be solved, with their unsolved dependencies.
+    cycles
+        groups of items that depend on each other (strongly connected
+        components), only if requested when solving.
+    """
+
+    def __init__(
+        self,
+        remaining: dict[Any, set[Any]],
+        cycles: list[set[Any]] | None = None,
+    ) -> None:
+        self.remaining = remaining
+        self.cycles = cycles
+        items: Iterable[tuple[Any, set[Any]]]
+        if cycles is None:
+            items = remaining.items()
+        else:
+            members = set().union(*cycles)
+            items = ((k, v & members) for k, v in remaining.items() if k in members)
+        super().__init__(
+            "Cyclic dependencies exist among these items: {}".format(
+                ", ".join(repr(x) for x in items)
+            )
+        )
+
+
+def _find_cycles[TH: Hashable](graph: Mapping[TH, set[TH]]) -> list[set[TH]]:
+    """Strongly connected components of a graph forming cycles,
+    using the (iterative) Kosaraju algorithm.
+    """
+    order: list[TH] = []
+    visited: set[TH] = set()
+    for start in graph:
+        if start in visited:
+            continue
+        visited.add(start)
+        stack = [(start, iter(graph[start]))]
+        while stack:
+            node, it = stack[-1]
+            for nxt in it:
+                if nxt in graph and nxt not in visited:
+                    visited.add(nxt)
+                    stack.append((nxt, iter(graph[nxt])))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+
+    reverse: dict[TH, list[TH]] = {k: [] for k in graph}
+    for k, deps in graph.items():
+        for dep in deps:
+            if dep in reverse:
+                reverse[dep].append(k)
+
+    cycles: list[set[TH]] = []
+    assigned: set[TH] = set()
+    for start in reversed(order):
+        if start in assigned:
+            continue
+        component = {start}
+        assigned.add(start)
+        todo = [start]
+        while todo:
+            for nxt in reverse[todo.pop()]:
+                if nxt not in assigned:
+                    assigned.add(nxt)
+                    component.add(nxt)
+                    todo.append(nxt)
+        if len(component) > 1 or start in graph[start]:
+            cycles.append(component)
+    return cycles
 
 
 def solve_dependencies[TH: Hashable](
     dependencies: Mapping[TH, set[TH]],
+    *,
+    report_cycles: bool = False,
 ) -> Iterator[set[TH]]:
     """Solve a dependency graph.
 
+    Layers are built with the Kahn algorithm (counting the unsolved
+    dependencies of each item), in time linear with the size of the graph.
+
     Parameters
     ----------
     dependencies :
         dependency dictionary. For each key, the value is an iterable indicating its
         dependencies.
+    report_cycles :
+        if True, find the items forming cycles when cyclic dependencies
+        are found, instead of reporting all unsolved items.
 
     Yields
     ------
@@ -37,24 +127,41 @@ def solve_dependencies[TH: Hashable](
 
     Raises
     ------
-    ValueError
+    CyclicDependencyError (ValueError)
         if a cyclic dependency is found.
     """
-    while dependencies:
-        # values not in keys (items without dep)
-        t = {i for v in dependencies.values() for i in v} - dependencies.keys()
-        # and keys without value (items without dep)
-        t.update(k for k, v in dependencies.items() if not v)
-        # can be done right away
-        if not t:
-            raise ValueError(
-                "Cyclic dependencies exist among these items: {}".format(
-                    ", ".join(repr(x) for x in dependencies.items())
-                )
-            )
-        # and cleaned up
-        dependencies = {k: v - t for k, v in dependencies.items() if v}
-        yield t
+    # Number of unsolved dependencies of each item,
+    # and items depending on each item.
+    pending: dict[TH, int] = {}
+    dependents: dict[TH, list[TH]] = {}
+    for k, deps in dependencies.items():
+        pending[k] = len(deps)
+        for dep in deps:
+            dependents.setdefault(dep, []).append(k)
+            pending.setdefault(dep, 0)
+
+    layer = {k for k, count in pending.items() if not count}
+    solved = 0
+    while layer:
+        yield layer
+        solved += len(layer)
+        next_layer: set[TH] = set()
+        for item in layer:
+            for dependent in dependents.get(item, ()):
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    next_layer.add(dependent)
+        layer = next_layer
+
+    if solved < len(pending):
+        remaining = {
+            k: {dep for dep in v if pending.get(dep)}
+            for k, v in dependencies.items()
+            if pending[k]
+        }
+        raise CyclicDependencyError(
+            remaining, _find_cycles(remaining) if report_cycles else None
+        )
 
 
 def compute_dependencies[TH: Hashable](
@@ -63,7 +170,8 @@ def compute_dependencies[TH: Hashable](
 ) -> dict[TH, set[TH]]:
     dependencies: dict[TH, set[TH]] = {}
     for k, v in content.items():
-        contents = count_named(v)
+        # The (cached) summary of each value is shared with other queries.
+        contents = analyze(v).counts
         if contents == {k: 1}:
             dependencies[k] = set()
         else:
@@ -71,21 +179,214 @@ def compute_dependencies[TH: Hashable](
     return dependencies
 
 
+def _substitute_item(expr: Any, replacements: Mapping[Any, Any]) -> Any:
+    from . import substitute
+
+    return substitute(expr, replacements)
+
+
+def _translate_item(
+    expr: Any, replacements: Mapping[Any, Any], libsl: ModuleType | str
+) -> Any:
+    from . import substitute
+
+    if isinstance(libsl, str):
+        # Modules cannot be pickled, so they are given by name to other processes.
+        libsl = importlib.import_module(libsl)
+    return translate(substitute(expr, replacements), libsl)
+
+
+def _map_layers[TH: Hashable](
+    func: Callable[..., Any],
+    content: Mapping[TH, Any],
+    graph: Mapping[TH, set[TH]],
+    dependencies: Mapping[TH, set[TH]],
+    results: dict[TH, Any],
+    executor: Executor | None,
+    *args: Any,
+) -> dict[TH, Any]:
+    """Compute func(content[item], replacements, *args) for the items of graph,
+    layer by layer, with the results of their dependencies as replacements.
+
+    Items within a layer are independent, so they are processed concurrently
+    if an executor is given. Within a layer, items are processed (and
+    stored in results) in the order of content.
+    """
+    order = {k: ndx for ndx, k in enumerate(content)}
+    # Layers are solved first, so nothing is processed if there are cycles.
+    layers = list(solve_dependencies(graph))
+    out: dict[TH, Any] = {}
+    for layer in layers:
+        items = sorted(layer, key=order.__getitem__)
+        exprs = [content[item] for item in items]
+        replacements = [
+            {dep: results[dep] for dep in dependencies[item]} for item in items
+        ]
+        values: Iterator[Any]
+        if executor is None or len(items) == 1:
+            values = map(func, exprs, replacements, *map(itertools.repeat, args))
+        else:
+            values = executor.map(
+                func,
+                exprs,
+                replacements,
+                *(itertools.repeat(a, len(items)) for a in args),
+            )
+        for item, value in zip(items, values):
+            out[item] = results[item] = value
+    return out
+
+
 def substitute_content[TH: Hashable](
     content: Mapping[TH, Any],
     *,
     is_dependency: Callable[[Any], bool],
+    executor: Executor | None = None,
 ) -> dict[TH, Any]:
-    from . import substitute
+    """Substitute a group of assignments into each other.
 
+    Parameters
+    ----------
+    content
+        a mapping of assigments.
+    is_dependency
+        callable that takes a python object/value and returns True
+        if it should be considered as the dependency of another.
+    executor
+        if given, independent assignments are substituted concurrently.
+    """
     dependencies = compute_dependencies(content, is_dependency)
-    layers = solve_dependencies(dependencies)
-    out: dict[TH, Any] = {}
-    for layer in layers:
-        for item in layer:
-            out[item] = substitute(content[item], out)
+    return _map_layers(
+        _substitute_item, content, dependencies, dependencies, {}, executor
+    )
 
-    return out
+
+class ContentEvaluator[TH: Hashable]:
+    """Translate a group of assignments and keep the results up to date.
+
+    The dependency graph and the results are kept, so that when some
+    assignments are updated only those and their (transitive) dependents
+    are translated again.
+
+    Parameters
+    ----------
+    content
+        a mapping of assigments.
+    libsl
+        symbolite implementation module.
+    is_dependency
+        callable that takes a python object/value and returns True
+        if it should be considered as the dependency of another.
+    executor
+        if given, independent assignments are translated concurrently.
+        With a process pool, libsl must be importable by name in the workers.
+    """
+
+    def __init__(
+        self,
+        content: Mapping[TH, Any],
+        *,
+        libsl: ModuleType,
+        is_dependency: Callable[[Any], bool],
+        executor: Executor | None = None,
+    ) -> None:
+        self.libsl = libsl
+        self.is_dependency = is_dependency
+        self.executor = executor
+        self._content: dict[TH, Any] = dict(content)
+        self._dependencies = compute_dependencies(self._content, is_dependency)
+        self._dependents: dict[TH, set[TH]] = {}
+        for k, deps in self._dependencies.items():
+            for dep in deps:
+                self._dependents.setdefault(dep, set()).add(k)
+        self._results: dict[TH, Any] = {}
+        self._evaluate(self._dependencies)
+
+    @property
+    def results(self) -> Mapping[TH, Any]:
+        """Translated value of each assignment."""
+        return MappingProxyType(self._results)
+
+    def _evaluate(self, graph: Mapping[TH, set[TH]]) -> dict[TH, Any]:
+        libsl: ModuleType | str = self.libsl
+        if isinstance(self.executor, ProcessPoolExecutor):
+            libsl = self.libsl.__name__
+        return _map_layers(
+            _translate_item,
+            self._content,
+            graph,
+            self._dependencies,
+            self._results,
+            self.executor,
+            libsl,
+        )
+
+    def _set_dependencies(self, key: TH, deps: set[TH]) -> None:
+        for dep in self._dependencies.get(key, ()):
+            self._dependents[dep].discard(key)
+        for dep in deps:
+            self._dependents.setdefault(dep, set()).add(key)
+        self._dependencies[key] = deps
+
+    def update(self, changes: Mapping[TH, Any]) -> dict[TH, Any]:
+        """Update (or add) assignments, and translate them and their dependents.
+
+        Parameters
+        ----------
+        changes
+            a mapping of assigments.
+
+        Returns
+        -------
+        dict
+            the new results of the translated assignments.
+
+        Raises
+        ------
+        CyclicDependencyError (ValueError)
+            if the changes introduce a cyclic dependency.
+
+        If an exception is raised (also while translating),
+        the changes are not applied and the results are kept.
+        """
+        previous = {
+            k: (self._content[k], self._dependencies[k])
+            for k in changes
+            if k in self._content
+        }
+        for k, deps in compute_dependencies(changes, self.is_dependency).items():
+            self._content[k] = changes[k]
+            self._set_dependencies(k, deps)
+
+        affected = set(changes)
+        todo = list(changes)
+        while todo:
+            for dependent in self._dependents.get(todo.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    todo.append(dependent)
+
+        # Items that are not affected have already been translated.
+        previous_results = {k: self._results[k] for k in affected if k in self._results}
+        try:
+            return self._evaluate(
+                {k: self._dependencies[k] & affected for k in affected}
+            )
+        except Exception:
+            for k in changes:
+                if k in previous:
+                    self._content[k], deps = previous[k]
+                    self._set_dependencies(k, deps)
+                else:
+                    del self._content[k]
+                    self._set_dependencies(k, set())
+                    del self._dependencies[k]
+            for k in affected:
+                if k in previous_results:
+                    self._results[k] = previous_results[k]
+                else:
+                    self._results.pop(k, None)
+            raise
 
 
 def eval_content[TH: Hashable](
@@ -93,6 +394,7 @@ def eval_content[TH: Hashable](
     *,
     libsl: ModuleType,
     is_dependency: Callable[[Any], bool],
+    executor: Executor | None = None,
 ) -> dict[TH, Any]:
     """Translate a group of assignments using the given backend.
 
@@ -108,15 +410,12 @@ def eval_content[TH: Hashable](
     is_dependency
         callable that takes a python object/value and returns True
         if it should be considered as the dependency of another.
+    executor
+        if given, independent assignments are translated concurrently
+        (e.g. a thread pool for backends releasing the GIL or a process pool).
+        With a process pool, libsl must be importable by name in the workers.
     """
-    from . import substitute
-
-    dependencies = compute_dependencies(content, is_dependency)
-    layers = solve_dependencies(dependencies)
-
-    out: dict[TH, Any] = {}
-    for layer in layers:
-        for item in layer:
-            out[item] = translate(substitute(content[item], out), libsl)
-
-    return out
+    evaluator = ContentEvaluator(
+        content, libsl=libsl, is_dependency=is_dependency, executor=executor
+    )
+    return dict(evaluator.results)
@@ -0,0 +1,65 @@
+from typing import Any
+
+import pytest
+
+from symbolite import Real, UserFunction, real
+from symbolite.impl import libnumpy, libstd
+from symbolite.ops import analyze, count_named, find_unsupported
+from symbolite.ops.base import free_values, unique_named
+
+x, y = map(Real, "xy")
+
+F: UserFunction[Any, Any, Real] = UserFunction("F", output_type=Real)
+F.register_impl(lambda v: v, libsl=libstd)
+
+
+def test_summary():
+    expr = real.cos(x) * y + real.pi * x
+    summary = analyze(expr)
+    assert dict(summary.counts) == count_named(expr)
+    assert summary.counts[x] == 2
+    assert summary.named == unique_named(expr)
+    assert summary.free_values == free_values(expr) == (x, y)
+    assert summary.namespaces == {"", "real"}
+    assert summary.functions == {"real": (real.add, real.mul, real.cos)}
+    # add, 2 * mul, cos, x, y, pi, x
+    assert summary.node_count == 8
+    assert summary.depth == 3
+
+
+@pytest.mark.parametrize(
+    "expr,node_count,depth",
+    [
+        (x, 1, 0),
+        (real.cos(x), 2, 1),
+        (real.cos(real.sin(x)) + 2, 5, 3),
+        ((x, [y, 1]), 3, 0),
+    ],
+)
+def test_size(expr, node_count, depth):
+    summary = analyze(expr)
+    assert summary.node_count == node_count
+    assert summary.depth == depth
+
+
+def test_shared_subtrees():
+    # A DAG with 2 ** 40 paths from the root is summarized without expanding it.
+    expr = x
+    for _ in range(40):
+        expr = expr + expr
+    summary = analyze(expr)
+    assert summary.counts == {real.add: 2**40 - 1, x: 2**40}
+    assert summary.node_count == 2**41 - 1
+    assert summary.depth == 40
+
+
+def test_cached():
+    expr = real.cos(x) + y
+    assert analyze(expr) is analyze(expr)
+    assert analyze(x + 1) is not analyze(x + 1)
+
+
+def test_find_unsupported():
+    expr = real.erf(x) + F(y) * real.cos(x)
+    assert find_unsupported(expr, libstd) == ()
+    assert find_unsupported(expr, libnumpy) == (real.erf, F)
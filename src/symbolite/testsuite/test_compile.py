@@ -0,0 +1,77 @@
+import math
+import types
+
+import pytest
+
+from symbolite import Real, real, vector
+from symbolite.impl import get_all_implementations, libpythoncode, libstd
+from symbolite.ops import compile_expr, substitute, substitute_many, translate
+
+x, y = map(Real, "xy")
+
+all_impl = get_all_implementations()
+
+
+@pytest.mark.parametrize("libsl", all_impl.values(), ids=all_impl.keys())
+@pytest.mark.parametrize(
+    "expr",
+    [
+        x + 2 * y,
+        real.cos(x) * real.pi - real.exp(y),
+        (x * y, x - y),
+    ],
+)
+def test_compile_matches_translate(expr, libsl: types.ModuleType):
+    func = compile_expr(expr, libsl=libsl)
+    values = {x: 0.5, y: 2.0}
+    if isinstance(expr, tuple):
+        expected = translate(substitute_many(expr, values), libsl)
+    else:
+        expected = translate(substitute(expr, values), libsl)
+    assert func(0.5, 2.0) == expected
+
+
+def test_inputs_order():
+    func = compile_expr(x - y, inputs=(y, x), libsl=libstd)
+    assert func(1, 3) == 2
+    assert func.__symbolite_def__ == "def __symbolite_expr(y, x):\n    return x - y"
+
+
+def test_no_inputs():
+    assert compile_expr(real.pi * 2, libsl=libstd)() == 2 * math.pi
+
+
+def test_vector_input():
+    v = vector.Vector("v")
+    func = compile_expr(v[0] * v[1], libsl=libstd)
+    assert func([2, 3]) == 6
+
+
+def test_cached():
+    func = compile_expr(real.sin(x) + y, libsl=libstd)
+    assert compile_expr(real.sin(x) + y, libsl=libstd) is func
+    assert compile_expr(real.sin(x) + y, inputs=(y, x), libsl=libstd) is not func
+    assert compile_expr(real.sin(y) + x, libsl=libstd) is not func
+
+
+class _Two:
+    # Not fingerprintable, but translated by its repr.
+    def __repr__(self) -> str:
+        return "2"
+
+
+def test_not_cached():
+    func = compile_expr(x * _Two(), libsl=libstd)
+    assert func(3) == 6
+    assert compile_expr(x * _Two(), libsl=libstd) is not func
+
+
+def test_invalid():
+    with pytest.raises(ValueError, match="not given as inputs"):
+        compile_expr(x + y, inputs=(x,), libsl=libstd)
+
+    with pytest.raises(ValueError, match="parameter name"):
+        compile_expr(Real("real") + 1, libsl=libstd)
+
+    with pytest.raises(ValueError, match="cannot be used for compilation"):
+        compile_expr(x + 1, libsl=libpythoncode)
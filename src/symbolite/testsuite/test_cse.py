@@ -0,0 +1,112 @@
+import math
+
+import pytest
+
+from symbolite import Real, real
+from symbolite.abstract.lang import Assign, Block
+from symbolite.core.symbolite_object import get_symbolite_info
+from symbolite.impl import get_all_implementations, libpythoncode, libstd
+from symbolite.ops import cse, substitute, translate
+
+k, t, a, b = map(Real, "ktab")
+decay = real.exp(-k * t)
+
+all_impl = get_all_implementations()
+
+
+def test_expressions():
+    block = cse((decay * a + decay * b, decay**2, real.cos(decay * a)))
+    assert translate(block, libpythoncode) == (
+        "def __symbolite_block(k: real.Real, t: real.Real, a: real.Real, b: real.Real)"
+        " -> tuple[real.Real, real.Real, real.Real]:\n"
+        "    _cse0 = real.exp(-k * t)\n"
+        "    _cse1 = _cse0 * a\n"
+        "    out0 = _cse1 + _cse0 * b\n"
+        "    out1 = _cse0 ** 2\n"
+        "    out2 = real.cos(_cse1)\n"
+        "    return out0, out1, out2"
+    )
+
+
+def test_block():
+    total, out = Real("total"), Real("out")
+    block = Block(
+        (a, b),
+        (out,),
+        (
+            Assign(total, real.sin(a + b) * 2),
+            Assign(out, real.exp(total) + real.exp(total) * real.sin(a + b)),
+        ),
+        name="g",
+    )
+    assert translate(cse(block), libpythoncode) == (
+        "def g(a: real.Real, b: real.Real) -> real.Real:\n"
+        "    _cse0 = real.sin(a + b)\n"
+        "    total = _cse0 * 2\n"
+        "    _cse1 = real.exp(total)\n"
+        "    out = _cse1 + _cse1 * _cse0\n"
+        "    return out"
+    )
+
+
+def test_reassignment():
+    x, u, v, w = map(Real, "xuvw")
+    block = Block(
+        (x,),
+        (u, v, w),
+        (
+            Assign(a, x + 1),
+            Assign(u, real.exp(a) * 2),
+            Assign(a, a * 10),
+            Assign(v, real.exp(a) * 3),
+            Assign(w, real.exp(a) * 4),
+        ),
+    )
+    expected = translate(block, libstd)(0.5)
+    assert translate(cse(block), libstd)(0.5) == expected
+    assert translate(cse(block), libpythoncode) == (
+        "def __symbolite_block(x: real.Real)"
+        " -> tuple[real.Real, real.Real, real.Real]:\n"
+        "    a = x + 1\n"
+        "    u = real.exp(a) * 2\n"
+        "    a = a * 10\n"
+        "    _cse0 = real.exp(a)\n"
+        "    v = _cse0 * 3\n"
+        "    w = _cse0 * 4\n"
+        "    return u, v, w"
+    )
+
+
+def test_deterministic_names():
+    taken = Real("_cse0")
+    expr = real.cos(taken + a) * real.cos(taken + a)
+    block = cse(expr, name="f")
+    assert block == cse(expr, name="f")
+    (temporary, output) = get_symbolite_info(block).lines
+    assert get_symbolite_info(temporary).lhs == Real("_cse1")
+    assert get_symbolite_info(output).rhs == Real("_cse1") * Real("_cse1")
+
+
+def test_no_repetition():
+    (line,) = get_symbolite_info(cse(k + 1)).lines
+    assert get_symbolite_info(line).rhs == k + 1
+
+
+def test_shared_dag():
+    # A DAG with 2 ** 40 paths from the root has one temporary per level.
+    expr = real.cos(a)
+    for _ in range(40):
+        expr = expr + expr
+    lines = get_symbolite_info(cse(expr, prefix="tmp")).lines
+    assert len(lines) == 41
+    assert get_symbolite_info(lines[-1]).rhs == Real("tmp39") + Real("tmp39")
+
+
+@pytest.mark.parametrize("libsl", all_impl.values(), ids=all_impl.keys())
+def test_evaluate(libsl):
+    exprs = (decay * a + decay * b, decay**2, real.cos(decay * a))
+    func = translate(cse(exprs, inputs=(a, b, k, t)), libsl)
+    values = {a: 1.0, b: 2.0, k: 0.5, t: 3.0}
+    expected = tuple(translate(substitute(expr, values), libsl) for expr in exprs)
+    for result, value in zip(func(1.0, 2.0, 0.5, 3.0), expected):
+        assert math.isclose(result, value)
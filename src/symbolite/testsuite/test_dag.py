@@ -0,0 +1,87 @@
+import pickle
+from typing import Any
+
+import pytest
+
+from symbolite import Symbol, UserFunction, real, vector
+from symbolite.core.dag import OP_CALL, OP_NAME, ExpressionDAG
+from symbolite.impl import libstd
+from symbolite.ops import count_named, substitute, translate
+
+x, y, z = map(real.Real, ("x", "y", "z"))
+v = vector.Vector("v")
+
+
+def _f(a, b=0):
+    return a - b
+
+
+F: UserFunction[Any, Any, real.Real] = UserFunction("F", output_type=real.Real)
+F.register_impl(_f, libsl="default")
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        x,
+        2,
+        x + 1,
+        real.cos(x) * real.cos(x) + 2 * y,
+        x + 1 + (x + 1.0),
+        real.Real(3) * x,
+        v[1] + vector.sum((1, 2, 3)),  # type: ignore[arg-type]
+        F(x, b=y),
+        Symbol("s")[[1, 2]],
+    ],
+)
+def test_roundtrip(expr):
+    dag = ExpressionDAG.from_expr(expr)
+    assert dag.to_expr() == expr
+    assert repr(dag.to_expr()) == repr(expr)
+    assert pickle.loads(pickle.dumps(dag)) == dag
+
+
+def test_shared_subtrees():
+    a = real.cos(x) * real.cos(x)
+    b = real.cos(x) * real.cos(x)
+    dag = ExpressionDAG.from_expr(a + b)
+    # The name x, the calls cos(x), cos(x) * cos(x) and a + b,
+    # and the values wrapping each call.
+    assert len(dag) == 7
+    assert list(dag.opcodes).count(OP_NAME) == 1
+    assert list(dag.opcodes).count(OP_CALL) == 3
+    assert dag.multiplicities()[0] == 4
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        x + 1,
+        real.cos(x) * real.cos(x) + 2 * y,
+        F(x, b=y) + F(y),
+        real.Real(3) * x,
+    ],
+)
+def test_translate_substitute_count(expr):
+    dag = ExpressionDAG.from_expr(expr)
+    mapping = {x: 3, y: z * 2, z: 1}
+
+    assert translate(substitute(dag, {x: 3, y: 2}), libstd) == translate(
+        substitute(expr, {x: 3, y: 2}), libstd
+    )
+    assert substitute(dag, mapping).to_expr() == substitute(expr, mapping)
+    assert substitute(dag, {real.cos: real.sin}).to_expr() == substitute(
+        expr, {real.cos: real.sin}
+    )
+    assert count_named(dag) == count_named(expr)
+
+
+def test_deep_expression():
+    expr = x
+    for _ in range(5_000):
+        expr = expr + y
+
+    dag = ExpressionDAG.from_expr(expr)
+    assert len(dag) == 2 * 5_000 + 2
+    assert translate(substitute(dag, {x: 1, y: 2}), libstd) == 10_001
+    assert count_named(dag)[y] == 5_000
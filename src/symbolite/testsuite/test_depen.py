@@ -1,3 +1,5 @@
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Any
 
 import pytest
@@ -5,7 +7,13 @@
 from symbolite import real
 from symbolite.impl import libstd
 from symbolite.ops import substitute
-from symbolite.ops.util import eval_content, substitute_content
+from symbolite.ops.util import (
+    ContentEvaluator,
+    CyclicDependencyError,
+    eval_content,
+    solve_dependencies,
+    substitute_content,
+)
 
 
 class SimpleVariable(real.Real):
@@ -62,3 +70,95 @@ def test_cyclic():
 
     with pytest.raises(ValueError):
         assert eval_content(d, libsl=libstd, is_dependency=is_dependency)
+
+
+def test_solve_dependencies_layers():
+    deps = {"a": {"x"}, "b": {"a", "y"}, "c": set(), "d": {"b", "c"}}
+    assert list(solve_dependencies(deps)) == [{"x", "y", "c"}, {"a"}, {"b"}, {"d"}]
+
+    n = 10_000
+    chain = {i: {i - 1} for i in range(1, n)}
+    assert list(solve_dependencies(chain)) == [{i} for i in range(n)]
+
+
+def test_solve_dependencies_cycles():
+    deps = {1: {2}, 2: {1}, 3: {2}, 4: {4}, 5: set()}
+
+    with pytest.raises(CyclicDependencyError) as exc:
+        list(solve_dependencies(deps))
+    assert exc.value.remaining == {1: {2}, 2: {1}, 3: {2}, 4: {4}}
+    assert exc.value.cycles is None
+
+    with pytest.raises(ValueError, match=r"\(1, \{2\}\), \(2, \{1\}\), \(4, \{4\}\)$"):
+        list(solve_dependencies(deps, report_cycles=True))
+
+
+def test_content_evaluator_update():
+    x, y, z, w = map(SimpleParameter, "xyzw")
+    content = {x: 1, y: 2 * x, z: y + 1, w: 5}
+    evaluator = ContentEvaluator(content, libsl=libstd, is_dependency=is_dependency)
+    assert evaluator.results == {x: 1, y: 2, z: 3, w: 5}
+
+    assert evaluator.update({x: 2}) == {x: 2, y: 4, z: 5}
+    assert evaluator.update({w: x}) == {w: 2}
+    assert evaluator.update({y: w * 10}) == {y: 20, z: 21}
+    assert evaluator.update({x: 3}) == {x: 3, w: 3, y: 30, z: 31}
+
+    with pytest.raises(ValueError):
+        evaluator.update({x: z})
+    assert evaluator.results == {x: 3, y: 30, z: 31, w: 3}
+    assert evaluator.update({x: 0}) == {x: 0, w: 0, y: 0, z: 1}
+
+
+def test_content_evaluator_update_failed_translation():
+    x, y, z, v = map(SimpleParameter, "xyzv")
+    content = {x: 1, y: 2 * x, z: real.log(y)}
+    evaluator = ContentEvaluator(content, libsl=libstd, is_dependency=is_dependency)
+    before = dict(evaluator.results)
+
+    with pytest.raises(ValueError):
+        evaluator.update({x: -1})
+    assert evaluator.results == before
+
+    with pytest.raises(ValueError):
+        evaluator.update({v: real.log(-1.0)})
+    assert evaluator.results == before
+
+    # The failed changes were not kept.
+    assert evaluator.update({y: 3 * x}) == {y: 3, z: math.log(3)}
+    assert evaluator.results.keys() == {x, y, z}
+
+
+def test_content_evaluator_matches_eval_content():
+    x, y = map(SimpleParameter, "xy")
+    content = {x: 1, y: 2 * x}
+    evaluator = ContentEvaluator(content, libsl=libstd, is_dependency=is_dependency)
+    evaluator.update({x: 4})
+    content[x] = 4
+    assert dict(evaluator.results) == eval_content(
+        content, libsl=libstd, is_dependency=is_dependency
+    )
+
+
+@pytest.mark.parametrize("executor_cls", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_content_executor(
+    executor_cls: type[ThreadPoolExecutor] | type[ProcessPoolExecutor],
+):
+    params = [SimpleParameter(f"p{i}") for i in range(20)]
+    content: dict[Any, Any] = {p: i for i, p in enumerate(params)}
+    total = SimpleParameter("total")
+    content[total] = real.balanced_sum(params)
+    content[SimpleParameter("double")] = 2 * total
+
+    expected = eval_content(content, libsl=libstd, is_dependency=is_dependency)
+    with executor_cls(max_workers=2) as executor:
+        out = eval_content(
+            content, libsl=libstd, is_dependency=is_dependency, executor=executor
+        )
+        assert list(out.items()) == list(expected.items())
+        assert out[total] == sum(range(20))
+
+        substituted = substitute_content(
+            content, is_dependency=is_dependency, executor=executor
+        )
+        assert substituted == substitute_content(content, is_dependency=is_dependency)
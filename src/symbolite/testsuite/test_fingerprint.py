@@ -0,0 +1,93 @@
+import os
+import pickle
+import subprocess
+import sys
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from symbolite import Real, Symbol, real
+from symbolite.core.value import Name
+from symbolite.ops import fingerprint
+
+x, y = map(Real, "xy")
+
+EXPR_CODE = "real.cos(x) + 2 * y ** 3"
+
+
+def _chain(n: int) -> Real:
+    expr = x
+    for _ in range(n):
+        expr = expr + 1
+    return expr
+
+
+def test_fingerprint_equal():
+    assert fingerprint(eval(EXPR_CODE)) == fingerprint(eval(EXPR_CODE))
+    assert len(fingerprint(x)) == 32
+
+
+@pytest.mark.parametrize(
+    "left,right",
+    [
+        (x, y),
+        (x, Symbol("x")),
+        (x, Real(Name("x", "other"))),
+        (x + 1, x + 1.0),
+        (x + y, y + x),
+        (x - y, x + y),
+        (real.cos(x), real.sin(x)),
+        ((x, y), [x, y]),
+        (x + 1, x + True),
+        (x + 0.1, x + (0.1 + 2**-55)),
+        (x + Fraction(1, 3), x + Fraction(1, 4)),
+        (x + Decimal("1.0"), x + Decimal("1.00")),
+        (x + 1j, x + 1),
+        (Symbol("x") + "1", Symbol("x") + b"1"),
+    ],
+)
+def test_fingerprint_differ(left, right):
+    assert fingerprint(left) != fingerprint(right)
+
+
+class _Opaque:
+    def __repr__(self) -> str:
+        return "_Opaque()"
+
+
+def test_fingerprint_unknown_literal():
+    with pytest.raises(TypeError, match="Cannot fingerprint"):
+        fingerprint(x + _Opaque())
+
+
+def test_fingerprint_pickle():
+    expr = eval(EXPR_CODE)
+    assert fingerprint(pickle.loads(pickle.dumps(expr))) == fingerprint(expr)
+
+
+def test_fingerprint_across_processes():
+    code = (
+        "from symbolite import Real, real;"
+        "from symbolite.ops import fingerprint;"
+        "x, y = map(Real, 'xy');"
+        f"print(fingerprint({EXPR_CODE}))"
+    )
+    expected = fingerprint(eval(EXPR_CODE))
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert out.stdout.strip() == expected
+
+
+def test_fingerprint_shared_and_deep():
+    sub = real.cos(x) * y
+    assert fingerprint(sub + sub) == fingerprint(sub + real.cos(x) * y)
+    assert fingerprint(_chain(5_000)) == fingerprint(_chain(5_000))
+    assert fingerprint(_chain(5_000)) != fingerprint(_chain(4_999))
@@ -1,15 +1,20 @@
 import inspect
 import types
+from fractions import Fraction
 from typing import Any
 
 import pytest
 
-from symbolite import Symbol, real
+from symbolite import Real, Symbol, Vector, real, vector
+from symbolite.abstract import symbol
 from symbolite.abstract.lang import Assign, Block
+from symbolite.core.call import Call
+from symbolite.core.function import balanced_reduce
+from symbolite.core.symbolite_object import get_symbolite_info
 from symbolite.core.value import Value
-from symbolite.impl import get_all_implementations
-from symbolite.ops import substitute, translate
-from symbolite.ops.base import free_values, value_names
+from symbolite.impl import get_all_implementations, libstd
+from symbolite.ops import as_code, substitute, translate, yield_named
+from symbolite.ops.base import free_values, unique_named, value_names
 
 all_impl = get_all_implementations()
 
@@ -171,3 +176,98 @@ def test_lib_symbols(expr: Value[Any], replaced: Symbol, libsl: types.ModuleType
 )
 def test_list_symbols(expr: Value[Any], namespace: str | None, result: Symbol):
     assert value_names(expr, namespace) == result
+
+
+def test_associative_flatten():
+    expr = real.sum_of(real.sum_of(x, y), z)
+    value = get_symbolite_info(expr).value
+    assert isinstance(value, Call)
+    assert get_symbolite_info(value).args == (x, y, z)
+    assert expr == real.sum_of(x, real.sum_of(y, z))
+    assert as_code(expr) == "real.sum_of(x, y, z)"
+    assert as_code(real.product_of(x, y + z)) == "real.product_of(x, y + z)"
+
+
+@pytest.mark.parametrize(
+    "expr,result",
+    [
+        (real.sum_of(x, y, z), 6),
+        (real.product_of(x, y, z), 6),
+        (real.sum_of(x, real.product_of(y, z)), 7),
+        (symbol.sum_of(x, y, z), 6),
+    ],
+)
+@pytest.mark.parametrize("libsl", all_impl.values(), ids=all_impl.keys())
+def test_associative_translate(expr: Value[Any], result: int, libsl: types.ModuleType):
+    assert translate(substitute(expr, {x: 1, y: 2, z: 3}), libsl=libsl) == result
+    f = translate(_make_block_from_variable(expr), libsl=libsl)
+    if inspect.isfunction(f):
+        assert f(1, 2, 3) == result
+
+
+@pytest.mark.parametrize("module", [real, symbol])
+def test_associative_libstd_types(module: types.ModuleType):
+    assert translate(module.sum_of(), libsl=libstd) == 0
+    assert translate(module.product_of(), libsl=libstd) == 1
+    assert translate(module.sum_of(1, 2), libsl=libstd) == 3
+    assert type(translate(module.sum_of(1, 2), libsl=libstd)) is int
+    half = Fraction(1, 2)
+    assert translate(module.sum_of(half, half, 1), libsl=libstd) == Fraction(2)
+    assert translate(module.product_of(half, 4), libsl=libstd) == Fraction(2)
+
+
+def test_associative_deep():
+    terms = [real.Real(f"t{i}") for i in range(5_000)]
+    expr = real.sum_of(*terms)
+    values = dict.fromkeys(terms, 1)
+    assert translate(substitute(expr, values), libsl=libstd) == 5_000
+
+
+def _depth(expr: Any) -> int:
+    depth, stack = 0, [(expr, 0)]
+    while stack:
+        obj, level = stack.pop()
+        value = get_symbolite_info(obj).value
+        if isinstance(value, Call):
+            stack.extend((arg, level + 1) for arg in get_symbolite_info(value).args)
+        depth = max(depth, level)
+    return depth
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 8, 1_000])
+def test_balanced_reduction(n: int):
+    terms = [real.Real(f"t{i}") for i in range(n)]
+    expr = real.balanced_sum(terms)
+    assert _depth(expr) == (n - 1).bit_length()
+    assert [str(t) for t in yield_named(expr) if isinstance(t, Real)] == [
+        str(t) for t in terms
+    ]
+    values = {t: i for i, t in enumerate(terms)}
+    assert translate(substitute(expr, values), libsl=libstd) == sum(range(n))
+    prod = real.balanced_product(terms)
+    assert translate(substitute(prod, dict.fromkeys(terms, 2)), libsl=libstd) == 2**n
+
+
+def test_balanced_reduction_empty():
+    assert real.balanced_sum([]) == 0
+    assert real.balanced_product([]) == 1
+    assert isinstance(symbol.balanced_sum(map(Symbol, "abc")), Symbol)
+    assert isinstance(vector.balanced_product(map(Vector, "abc")), Vector)
+    with pytest.raises(TypeError):
+        balanced_reduce(real.add, [])
+
+
+def test_free_values_order():
+    shared = real.cos(y) * x
+    expr = shared + z * shared + x
+    assert free_values(expr) == (y, x, z)
+    assert free_values((z, expr)) == (z, y, x)
+    assert free_values(1) == ()
+    assert unique_named(expr) is unique_named(expr)
+
+
+def test_free_values_many():
+    terms = [real.Real(f"p{i}") for i in range(10_000)]
+    expr = real.balanced_sum(term * x for term in terms)
+    assert free_values(expr) == (terms[0], x, *terms[1:])
+    assert value_names(expr) == {"x", *(f"p{i}" for i in range(10_000))}
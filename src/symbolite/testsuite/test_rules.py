@@ -0,0 +1,92 @@
+import sys
+
+import pytest
+
+from symbolite import Real, real
+from symbolite.core.symbolite_object import get_symbolite_info
+from symbolite.ops import RewriteRule, RuleSet
+from symbolite.ops._rules import match
+
+a, b, x, y = map(Real, "abxy")
+
+pythagorean = RewriteRule(real.sin(a) ** 2 + real.cos(a) ** 2, 1)
+exp_log = RewriteRule(real.exp(real.log(a)), a)
+
+
+@pytest.mark.parametrize(
+    "expr,expected",
+    [
+        (real.sin(x) ** 2 + real.cos(x) ** 2, 1),
+        (y * (real.sin(x + y) ** 2 + real.cos(x + y) ** 2), y * 1),
+        (real.exp(real.log(x)), x),
+        (real.exp(real.log(real.exp(real.log(x + 1)))) * 3, (x + 1) * 3),
+        (real.cos(x) ** 2 + real.sin(x) ** 2, real.cos(x) ** 2 + real.sin(x) ** 2),
+    ],
+)
+def test_rewrite(expr, expected):
+    rules = RuleSet([pythagorean, exp_log])
+    assert rules.rewrite(expr) == expected
+
+
+def test_repeated_wildcard():
+    expr = real.sin(x) ** 2 + real.cos(y) ** 2
+    rules = RuleSet([pythagorean])
+    assert [rule.pattern for rule in rules.candidates(expr)] == [pythagorean.pattern]
+    assert match(pythagorean.pattern, expr, (a,)) is None
+    assert rules.rewrite(expr) is expr
+
+
+def test_priority():
+    first = RewriteRule(real.exp(real.log(a)), a)
+    second = RewriteRule(real.exp(b), real.cosh(b) + real.sinh(b))
+    expr = real.exp(real.log(x))
+    assert RuleSet([first, second]).rewrite(expr) == x
+    assert RuleSet([second, first]).rewrite(expr) == real.cosh(real.log(x)) + real.sinh(
+        real.log(x)
+    )
+
+
+def test_explicit_wildcards():
+    # x is not a wildcard, so only expressions with x are rewritten.
+    rules = RuleSet([RewriteRule(x * a, a * x, wildcards=(a,))])
+    assert rules.rewrite(x * y) == y * x
+    assert rules.rewrite(y * y) == y * y
+
+
+def test_literals_and_constants():
+    rules = RuleSet([RewriteRule(a**2, a * a), RewriteRule(real.cos(real.pi), -1)])
+    assert rules.rewrite(x**2 + x**3) == x * x + x**3
+    assert rules.rewrite(real.cos(real.pi) + real.cos(x)) == -1 + real.cos(x)
+
+
+def test_many_rules():
+    names = ["sin", "cos", "tan", "exp", "log", "sqrt", "sinh", "cosh", "tanh"]
+    funcs = [getattr(real, name) for name in names]
+    rules = RuleSet(
+        RewriteRule(f(g(a)), g(f(a))) for f in funcs for g in funcs if f is not g
+    )
+    assert len(rules) == len(funcs) * (len(funcs) - 1)
+    assert rules.candidates(real.sin(real.cos(x))) == [
+        RewriteRule(real.sin(real.cos(a)), real.cos(real.sin(a)), (a,))
+    ]
+    assert rules.rewrite(real.sin(real.cos(x)) + y) == real.cos(real.sin(x)) + y
+
+
+def test_structural_sharing():
+    untouched = real.tan(y) * 2
+    expr = real.exp(real.log(x)) + untouched
+    result = RuleSet([exp_log]).rewrite(expr)
+    assert get_symbolite_info(get_symbolite_info(result).value).args == (x, untouched)
+    assert get_symbolite_info(get_symbolite_info(result).value).args[1] is untouched
+
+
+def test_deep_rewrite():
+    expr = x
+    for _ in range(3 * sys.getrecursionlimit()):
+        expr = real.exp(real.log(expr))
+    assert RuleSet([exp_log]).rewrite(expr) == x
+
+
+def test_invalid_pattern():
+    with pytest.raises(ValueError):
+        RuleSet([RewriteRule(a, 1)])
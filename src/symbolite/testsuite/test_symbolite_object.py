@@ -0,0 +1,226 @@
+import pickle
+
+import pytest
+
+from symbolite import Symbol, UserFunction, real
+from symbolite.core import value
+from symbolite.core.call import Call
+from symbolite.core.interning import interning, is_interning
+from symbolite.core.lang import Assign, Block
+from symbolite.core.symbolite_object import get_symbolite_info
+from symbolite.ops import get_name
+
+x, y = map(real.Real, ("x", "y"))
+
+
+def _chain(n: int) -> real.Real:
+    expr = x
+    for _ in range(n):
+        expr = expr + y
+    return expr
+
+
+def test_hash_is_cached():
+    expr = real.cos(x) + 2 * y
+    assert expr.__symbolite_hash__ == hash(get_symbolite_info(expr))
+    assert hash(expr) == hash(real.cos(x) + 2 * y)
+
+
+def test_hash_deep_expression():
+    deep = _chain(5_000)
+    assert hash(deep) == hash(get_symbolite_info(deep))
+    assert {deep: 1}[deep] == 1
+
+
+def test_eq_deep_expression():
+    assert _chain(5_000) == _chain(5_000)
+    assert _chain(5_000) != _chain(5_001)
+    assert (_chain(5_000) + x) != (_chain(5_000) + y)
+
+
+def test_eq():
+    expr = real.cos(x) + 2 * y
+    assert expr == expr
+    assert expr == real.cos(x) + 2 * y
+    assert expr != real.cos(x) + 2 * x
+    assert expr != Symbol("x")
+    assert x + 1 == x + 1.0
+    assert Symbol("x")[[1, 2]] == Symbol("x")[[1, 2]]
+    assert Symbol("x")[[1, 2]] != Symbol("x")[[1, 3]]
+
+
+def test_eq_after_register_impl():
+    F = UserFunction("F", output_type=real.Real)
+    before = F(x) + y
+    F.register_impl(abs, libsl="default")
+    assert before == F(x) + y
+    assert F(x) + y in {before}
+    with interning():
+        interned = F(y)
+        F.register_impl(abs, libsl="default")
+        assert F(y) is interned
+
+
+def test_unhashable_content():
+    # Construction must not fail, only hashing.
+    expr = Symbol("x")[[1, 2]]
+    with pytest.raises(TypeError):
+        hash(expr)
+
+
+def test_pickle_recomputes_hash():
+    expr = real.cos(x) + 2 * y
+    load = pickle.loads(pickle.dumps(expr))
+    assert load == expr
+    assert hash(load) == hash(expr)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [x, x + y, get_symbolite_info(x + y).value, real.cos, real.add, Symbol("s")],
+)
+def test_no_instance_dict(obj: object):
+    assert not hasattr(obj, "__dict__")
+
+
+def test_interning():
+    with interning():
+        assert (x * y) is (x * y)
+        assert real.cos(x * y) is real.cos(x * y)
+        assert real.Real("x") is real.Real("x")
+        # Equal values of different types are kept apart.
+        assert (x + 1) is not (x + 1.0)
+        assert Call(real.add, (x, (1, 2)), ()) is not Call(real.add, (x, (1.0, 2)), ())
+        # Unhashable content is not interned.
+        assert Symbol("x")[[1]] is not Symbol("x")[[1]]
+
+        z = real.Real("z")
+        assert pickle.loads(pickle.dumps(z)) is z
+
+    assert not is_interning()
+    assert (x * y) is not (x * y)
+    assert (x * y) == (x * y)
+
+
+def test_anonymous_names(monkeypatch: pytest.MonkeyPatch):
+    # Restore the global counter after the test, starting as a new process.
+    monkeypatch.setattr(value, "_anonymous_counter", value._anonymous_counter)
+    monkeypatch.setattr(value, "_anonymous_namespace", value._anonymous_namespace)
+    monkeypatch.setattr(value, "_anonymous_next", {})
+
+    def build() -> tuple[str, ...]:
+        return tuple(get_name(real.Real()) for _ in range(3))  # type: ignore[arg-type]
+
+    value.reset_anonymous_names("worker1")
+    assert build() == (
+        "__symbolite_value_worker1_0",
+        "__symbolite_value_worker1_1",
+        "__symbolite_value_worker1_2",
+    )
+
+    value.reset_anonymous_names("worker2")
+    p = real.Real()
+    assert get_name(p) == "__symbolite_value_worker2_0"  # type: ignore[arg-type]
+
+    # Names of existing values are not given again.
+    with pytest.raises(ValueError, match="start at 3"):
+        value.reset_anonymous_names("worker1")
+    with pytest.raises(ValueError, match="start at 1"):
+        value.reset_anonymous_names("worker2")
+
+    value.reset_anonymous_names("worker1", start=10)
+    assert get_name(real.Real()) == "__symbolite_value_worker1_10"  # type: ignore[arg-type]
+
+    with pytest.raises(ValueError):
+        value.reset_anonymous_names("a.b")
+
+
+def test_set_name_does_not_mutate():
+    anonymous = real.Real()
+    info, hash_value = get_symbolite_info(anonymous), hash(anonymous)
+
+    class Model:
+        a = anonymous
+        b = real.Real()
+        c = real.Real("c")
+        expr = real.cos(a) + 2 * b + c
+
+    assert get_symbolite_info(anonymous) is info
+    assert hash(anonymous) == hash_value
+    assert Model.a == real.Real("a")
+    assert Model.b == real.Real("b")
+    assert Model.c == real.Real("c")
+    assert Model.expr == real.cos(Model.a) + 2 * Model.b + Model.c
+
+
+def test_set_name_interning():
+    with interning():
+        anonymous = real.Real()
+
+        class Model:
+            a = anonymous
+
+        assert Model.a is real.Real("a")
+        assert real.Real(get_symbolite_info(anonymous).value) is anonymous
+
+
+def test_set_name_mismatch():
+    with pytest.warns(UserWarning, match="Mismatched names"):
+
+        class Model:
+            a = real.Real("b")
+
+    assert Model.a == real.Real("a")
+
+
+def test_set_name_containers():
+    class Model:
+        a = real.Real()
+        b = real.Real()
+        eqs = (a + b, a * 2)
+        terms = [a, b + 1]
+        d = {"k": a + 1}
+
+    a, b = real.Real("a"), real.Real("b")
+    assert Model.eqs == (a + b, a * 2)
+    assert Model.terms == [a, b + 1]
+    assert Model.d == {"k": a + 1}
+
+
+def test_set_name_blocks():
+    class Model:
+        i = real.Real()
+        o = real.Real()
+        blk = Block((i,), (o,), (Assign(o, i * 2),))
+        line = Assign(o, i + 1)
+
+    i, o = real.Real("i"), real.Real("o")
+    assert Model.blk == Block((i,), (o,), (Assign(o, i * 2),))
+    assert Model.line == Assign(o, i + 1)
+
+
+class _UnitReal(real.Real):
+    def __init__(self, name: str = "", unit: str = "") -> None:
+        super().__init__(name)
+        self.unit = unit
+
+
+def test_subclass_init_arguments():
+    length = _UnitReal("length", "m")
+    assert length.unit == "m"
+    assert length == _UnitReal("length")
+    assert hash(length) == hash(_UnitReal("length", "cm"))
+
+    with interning():
+        assert _UnitReal("t", "s") is not _UnitReal("t", "s")
+
+    class Model:
+        t = _UnitReal(unit="s")
+
+    assert isinstance(Model.t, _UnitReal)
+    assert Model.t.unit == "s"
+    assert Model.t == _UnitReal("t")
+
+    load = pickle.loads(pickle.dumps(length))
+    assert load == length
+    assert load.unit == "m"
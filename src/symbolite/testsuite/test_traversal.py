@@ -0,0 +1,209 @@
+import io
+import math
+import sys
+import types
+from collections.abc import Iterator
+from functools import singledispatch
+from typing import Any
+
+import pytest
+
+from symbolite import Real, UserFunction, real
+from symbolite.core.symbolite_object import get_symbolite_info
+from symbolite.impl import get_all_implementations, libstd
+from symbolite.ops import (
+    Translator,
+    substitute,
+    substitute_many,
+    translate,
+    tree_view,
+    yield_named,
+)
+from symbolite.ops._traversal import HandlerTable, postorder, preorder
+from symbolite.ops._tree_view import Printer
+
+x, y = map(Real, "xy")
+
+all_impl = get_all_implementations()
+
+DEPTH = 3 * sys.getrecursionlimit()
+
+
+def _chain(n: int) -> Real:
+    expr = x
+    for _ in range(n):
+        expr = real.cos(expr) + y
+    return expr
+
+
+def test_deep_translate():
+    expr = substitute(_chain(DEPTH), {x: 0.0, y: 0.0})
+    expected = 0.0
+    for _ in range(DEPTH):
+        expected = math.cos(expected)
+    assert translate(expr, libstd) == expected
+
+
+def test_deep_yield_named():
+    named = list(yield_named(_chain(DEPTH)))
+    assert len(named) == 1 + 3 * DEPTH
+    assert named[:3] == [real.add, real.cos, real.add]
+    assert named.count(x) == 1
+
+
+def test_deep_tree_view():
+    out = io.StringIO()
+    printer = Printer(out, indent_width=0)
+    tree_view(_chain(DEPTH), printer)
+    printer.flush_line()
+    assert out.getvalue().count("real.cos(") == DEPTH
+
+
+class Marked(Real):
+    __slots__ = ()
+
+
+@translate.register
+def translate_marked(obj: Marked, libsl):
+    return "marked"
+
+
+@yield_named.register
+def yield_named_marked(obj: Marked):
+    yield "marked"
+
+
+def test_user_registered_implementations():
+    expr = real.cos(Marked("m")) + x
+    assert list(yield_named(expr)) == [real.add, real.cos, "marked", x]
+    assert translate(Marked("m") * 2, libstd) == "markedmarked"
+
+
+@singledispatch
+def nested_depth(obj: Any) -> int:
+    return 0
+
+
+@nested_depth.register
+def nested_depth_tuple(obj: tuple) -> int:
+    return postorder(obj, _depth_handlers)
+
+
+_depth_handlers = HandlerTable(nested_depth)
+
+
+@_depth_handlers.register(nested_depth_tuple)
+def _nested_depth_tuple(obj: tuple[Any, ...]) -> tuple[Any, Any]:
+    return obj, lambda node, results: 1 + max(results, default=0)
+
+
+@singledispatch
+def flatten(obj: Any) -> Iterator[Any]:
+    yield obj
+
+
+@flatten.register
+def flatten_list(obj: list) -> Iterator[Any]:
+    return preorder(obj, _flatten_handlers)
+
+
+_flatten_handlers = HandlerTable(flatten)
+
+
+@_flatten_handlers.register(flatten_list)
+def _flatten_list(obj: list[Any]) -> tuple[Any, Any]:
+    return (), obj
+
+
+def test_walkers():
+    nested: Any = ()
+    for _ in range(DEPTH):
+        nested = (1, nested, ())
+    assert nested_depth(nested) == DEPTH + 1
+    assert nested_depth(((), ((),))) == 3
+    assert nested_depth(3) == 0
+
+    nested = []
+    for n in range(DEPTH):
+        nested = [n, nested]
+    assert list(flatten(nested)) == list(range(DEPTH - 1, -1, -1))
+    assert list(flatten([1, (2, 3), [4, [5]]])) == [1, (2, 3), 4, 5]
+
+
+calls: list[Any] = []
+
+
+def _counted(a, b):
+    calls.append((a, b))
+    return a + b
+
+
+G: UserFunction[Any, Any, Real] = UserFunction("G", output_type=Real)
+G.register_impl(_counted, libsl="default")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("libsl", all_impl.values(), ids=all_impl.keys())
+def test_translator_memo(libsl: types.ModuleType):
+    # A DAG with 2 ** 40 paths from the root.
+    expr = Real(1)
+    for _ in range(40):
+        expr = G(expr, expr)
+    expr = expr * 2
+
+    calls.clear()
+    translator = Translator(libsl)
+    result = translator(expr)
+    assert len(calls) == 40
+
+    # Shared with other expressions translated with the same translator.
+    calls.clear()
+    translator(expr + 1)
+    assert not calls
+
+    calls.clear()
+    shared = G(1, 2)
+    small = G(shared, shared)
+    assert Translator(libsl)(small) == translate(small, libsl)
+    assert len(calls) == 2 + 3
+    assert result == 2**41
+
+
+def test_resolve_refreshed(monkeypatch: pytest.MonkeyPatch):
+    expr = real.cos(Real(0.0))
+    assert translate(expr, libstd) == 1.0
+    monkeypatch.setattr(libstd.real, "cos", lambda value: "patched")
+    assert translate(expr, libstd) == "patched"
+    monkeypatch.undo()
+    assert translate(expr, libstd) == 1.0
+    assert translate(real.pi, libstd) == math.pi
+
+
+def test_substitute_structural_sharing():
+    left = real.cos(x) * 2
+    right = real.sin(y) + 1
+    expr = left + right
+    assert substitute(expr, {Real("z"): 1}) is expr
+
+    out = substitute(expr, {y: 3})
+    assert out == left + (real.sin(3) + 1)
+    assert get_symbolite_info(get_symbolite_info(out).value).args[0] is left
+
+    shared = real.cos(y) + 1
+    out = substitute(shared * shared, {y: 0})
+    args = get_symbolite_info(get_symbolite_info(out).value).args
+    assert args[0] is args[1]
+
+
+def test_substitute_many():
+    shared = real.cos(x) * y
+    exprs = [shared + 1, shared * 2, x, 3]
+    mapping = {x: 0, y: 2}
+    out = substitute_many(exprs, mapping)
+    assert out == [substitute(expr, mapping) for expr in exprs]
+    first = get_symbolite_info(get_symbolite_info(out[0]).value).args[0]
+    second = get_symbolite_info(get_symbolite_info(out[1]).value).args[0]
+    assert first is second
+
+    assert substitute_many(tuple(exprs), mapping) == tuple(out)
+    assert substitute_many(dict(zip("abcd", exprs)), mapping) == dict(zip("abcd", out))
+    assert substitute_many(iter(exprs), mapping) == out
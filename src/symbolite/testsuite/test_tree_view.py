@@ -0,0 +1,115 @@
+import io
+import sys
+
+from symbolite import Real, real
+from symbolite.ops import tree_view
+from symbolite.ops._tree_view import Printer
+
+x, y = map(Real, "xy")
+
+shared = real.cos(x)
+expr = shared + y * real.sin(shared)
+
+
+class CountingWriter(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s: str) -> int:
+        self.writes += 1
+        return super().write(s)
+
+
+def _view(obj, **kwargs) -> str:
+    out = io.StringIO()
+    printer = Printer(out, **kwargs)
+    tree_view(obj, printer)
+    printer.close()
+    return out.getvalue()
+
+
+def test_default_printer(capsys):
+    tree_view(x + 1)
+    assert capsys.readouterr().out == "Real#real.add(\n  x,\n  1\n)\n"
+
+
+def test_full_view():
+    assert _view(expr) == (
+        "Real#real.add(\n"
+        "  Real#real.cos(\n"
+        "    x\n"
+        "  ),\n"
+        "  Real#real.mul(\n"
+        "    y,\n"
+        "    Real#real.sin(\n"
+        "      Real#real.cos(\n"
+        "        x\n"
+        "      )\n"
+        "    )\n"
+        "  )\n"
+        ")\n"
+    )
+
+
+def test_shared_labels():
+    assert _view(expr, shared=True) == (
+        "Real#real.add(\n"
+        "  #1 = Real#real.cos(\n"
+        "    x\n"
+        "  ),\n"
+        "  Real#real.mul(\n"
+        "    y,\n"
+        "    Real#real.sin(\n"
+        "      #1\n"
+        "    )\n"
+        "  )\n"
+        ")\n"
+    )
+
+
+def test_max_depth():
+    assert _view(expr, max_depth=2) == (
+        "Real#real.add(\n"
+        "  Real#real.cos(\n"
+        "    x\n"
+        "  ),\n"
+        "  Real#real.mul(\n"
+        "    y,\n"
+        "    ...\n"
+        "  )\n"
+        ")\n"
+    )
+    assert _view(expr, max_depth=0) == "...\n"
+
+
+def test_max_nodes():
+    assert _view(expr, max_nodes=3) == (
+        "Real#real.add(\n  Real#real.cos(\n    x\n  ),\n  ...\n)\n"
+    )
+
+
+def test_printer_reuse():
+    out = io.StringIO()
+    printer = Printer(out, max_nodes=2, shared=True)
+    tree_view(expr, printer)
+    printer.flush_line()
+    tree_view(expr, printer)
+    printer.flush_line()
+    assert out.getvalue() == 2 * _view(expr, max_nodes=2, shared=True)
+
+
+def test_chunked_writes():
+    deep = x
+    for _ in range(3 * sys.getrecursionlimit()):
+        deep = real.cos(deep)
+
+    out = CountingWriter()
+    printer = Printer(out, indent_width=0, chunk_size=1 << 12)
+    tree_view(deep, printer)
+    printer.close()
+    text = out.getvalue()
+    assert text.count("real.cos(") == 3 * sys.getrecursionlimit()
+    assert out.writes <= len(text) // (1 << 12) + 2
+
+    assert _view(deep, max_depth=3).count("\n") == 7
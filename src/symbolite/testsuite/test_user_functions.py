@@ -5,6 +5,7 @@
 from symbolite import UserFunction, translate
 from symbolite.core.call import Call
 from symbolite.core.symbolite_object import get_symbolite_info
+from symbolite.core.value import Value
 from symbolite.impl import get_all_implementations
 
 all_impl = get_all_implementations()
@@ -43,3 +44,17 @@ def test_user_functions(func, args, result, libsl: types.ModuleType):
     assert value_info.args == args
     assert translate(value_info.func, libsl) is func
     assert translate(output, libsl) == result
+
+
+def test_register_impl_keeps_hash():
+    uf = UserFunction("uf", output_type=Value)
+    before = uf(1)
+    calls = {before: 1}
+    previous = hash(uf)
+
+    uf.register_impl(f_1_1, libsl="default")
+    after = uf(1)
+    assert hash(uf) == previous
+    assert before == after
+    assert hash(before) == hash(after)
+    assert calls[after] == 1
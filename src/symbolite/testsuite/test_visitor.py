@@ -0,0 +1,167 @@
+import sys
+from collections import Counter
+from typing import Any
+
+from symbolite import Real, real
+from symbolite.abstract.lang import Assign, Block
+from symbolite.core.call import Call
+from symbolite.core.symbolite_object import get_symbolite_info
+from symbolite.impl import libstd
+from symbolite.ops import Rewriter, Visitor, fingerprint, substitute, translate
+
+x, y, z = map(Real, "xyz")
+
+
+class KindCounter(Visitor):
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+
+    def visit_value(self, obj: Any) -> None:
+        self.counts["value"] += 1
+
+    def visit_call(self, obj: Any) -> bool | None:
+        self.counts["call"] += 1
+        return None
+
+    def visit_function(self, obj: Any) -> None:
+        self.counts["function"] += 1
+
+    def visit_operator(self, obj: Any) -> None:
+        self.counts["operator"] += 1
+
+    def visit_block(self, obj: Any) -> None:
+        self.counts["block"] += 1
+
+    def visit_assign(self, obj: Any) -> None:
+        self.counts["assign"] += 1
+
+    def visit_other(self, obj: Any) -> None:
+        self.counts["other"] += 1
+
+
+class NoCalls(KindCounter):
+    def visit_call(self, obj: Any) -> bool:
+        self.counts["call"] += 1
+        return False
+
+
+class CosToSin(Rewriter):
+    def rewrite_call(self, obj: Call) -> Any:
+        info = get_symbolite_info(obj)
+        if info.func is real.cos:
+            return Call(real.sin, info.args, info.kwargs_items)
+        return obj
+
+
+class Renamer(Rewriter):
+    def rewrite_value(self, obj: Any) -> Any:
+        if obj is x:
+            return z
+        return obj
+
+
+def test_visitor_kinds():
+    visitor = KindCounter()
+    visitor.visit(real.cos(x) + 2)
+    assert visitor.counts == Counter(value=3, call=2, function=1, operator=1, other=1)
+
+
+def test_visitor_skip_children():
+    visitor = NoCalls()
+    visitor.visit([real.cos(x) + 2, y])
+    assert visitor.counts == Counter(value=2, call=1)
+
+
+def test_visitor_unique():
+    shared = real.cos(x)
+    expr = shared + shared
+
+    visitor = KindCounter()
+    visitor.visit(expr)
+    assert visitor.counts["function"] == 2
+
+    visitor = KindCounter()
+    visitor.visit(expr, unique=True)
+    assert visitor.counts["function"] == 1
+
+
+def test_visitor_block():
+    total = Real("total")
+    block = Block((x, y), (total,), (Assign(total, x + y),))
+    visitor = KindCounter()
+    visitor.visit(block)
+    assert visitor.counts["block"] == 1
+    assert visitor.counts["assign"] == 1
+    assert visitor.counts["operator"] == 1
+
+
+def test_visitor_tables_per_subclass():
+    KindCounter().visit(x + 1)
+    NoCalls().visit(x + 1)
+    assert KindCounter._table is not NoCalls._table
+    assert KindCounter._table[Call][0] is KindCounter.visit_call
+    assert NoCalls._table[Call][0] is NoCalls.visit_call
+    assert Call not in Visitor._table
+
+
+def test_rewriter():
+    expr = CosToSin().rewrite(real.cos(x) * 2 + y)
+    assert expr == real.sin(x) * 2 + y
+
+    assert Renamer().rewrite((x + 1, [y, x])) == (z + 1, [y, z])
+
+
+def test_rewriter_structural_sharing():
+    untouched = real.exp(y) * 3
+    expr = real.cos(x) + untouched
+    result = CosToSin().rewrite(expr)
+    assert result == real.sin(x) + untouched
+    assert get_symbolite_info(get_symbolite_info(result).value).args[1] is untouched
+
+    assert CosToSin().rewrite(untouched) is untouched
+
+
+class CountingRenamer(Renamer):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def rewrite_call(self, obj: Call) -> Any:
+        self.calls += 1
+        return obj
+
+
+def test_rewriter_shared_changed_leaf():
+    # A DAG with 2 ** 18 paths from the root, in which every call
+    # is rebuilt as the leaf changes. Each one is rewritten once.
+    expr = x
+    for _ in range(18):
+        shared = real.cos(expr)
+        expr = shared * shared
+
+    rewriter = CountingRenamer()
+    result = rewriter.rewrite(expr)
+    assert rewriter.calls == 2 * 18
+    assert fingerprint(result) == fingerprint(substitute(expr, {x: z}))
+
+
+def test_rewriter_block():
+    total = Real("total")
+    block = Block((x, y), (total,), (Assign(total, real.cos(x + y)),))
+    result = CosToSin().rewrite(block)
+    assert result != block
+    (line,) = get_symbolite_info(result).lines
+    assert get_symbolite_info(line).rhs == real.sin(x + y)
+
+
+def test_deep_rewrite():
+    depth = 3 * sys.getrecursionlimit()
+    expr = x
+    for _ in range(depth):
+        expr = real.cos(expr)
+    result = Renamer().rewrite(CosToSin().rewrite(expr))
+
+    visitor = KindCounter()
+    visitor.visit(result, unique=True)
+    assert visitor.counts["call"] == depth
+
+    assert translate(substitute(result, {z: 0.0}), libstd) == 0.0